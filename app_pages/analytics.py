@@ -0,0 +1,136 @@
+import streamlit as st
+
+from dashboard import config, schema
+from dashboard.charts import DEFAULT_PAIR, count_chart, pair_bars, pair_heatmap
+from dashboard.refresh import current_data
+from dashboard.service import CROSSTAB_MEASURES, cached_figure, load_crosstab, load_cube
+from dashboard.widgets import show_chart
+
+df, data_version, _ = current_data()
+cube = load_cube(data_version, df)
+
+st.title("📈 Analytics & Visualizations")
+st.write("---")
+
+# Create tabs for different plot types
+# With lazy tabs only the selected tab's body runs; tab.open is None when disabled
+tab1, tab2, tab3, tab4, tab5 = st.tabs(
+    ["Distribution", "Relationships", "Screen Time", "Study Habits", "Sleep Analysis"],
+    key="analytics_tab",
+    on_change="rerun" if config.LAZY_TABS else "ignore"
+)
+
+with tab1:
+    if tab1.open is not False:
+        st.subheader("Distribution Analysis")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Age Distribution**")
+            fig_age = cached_figure(data_version, 'age', lambda: count_chart(cube, 'age'))
+            show_chart('age', fig_age)
+        
+        with col2:
+            st.write("**Device Usage**")
+            fig_device = cached_figure(data_version, 'device', lambda: count_chart(cube, 'device'))
+            show_chart('device', fig_device)
+        
+        st.write("**Daily Study Hours Distribution**")
+        fig_study = cached_figure(data_version, 'study', lambda: count_chart(cube, 'study'))
+        show_chart('study', fig_study)
+
+with tab2:
+    if tab2.open is not False:
+        st.subheader("Relationship Analysis")
+        
+        st.write("**Question Pair Explorer**")
+        # Defaults shared with the cache warm-up, so the first view is already built
+        default_row, default_column, default_measure = DEFAULT_PAIR
+        questions = [col for col in cube.columns if col != schema.FOCUS]
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            pair_row = st.selectbox("Rows", questions, index=questions.index(default_row), key="pair_row")
+        column_options = [q for q in questions if q != pair_row]
+        with col2:
+            pair_column = st.selectbox("Columns", column_options, key="pair_column",
+                                       index=column_options.index(default_column) if default_column in column_options else 0)
+        with col3:
+            measure = st.selectbox("Show", list(CROSSTAB_MEASURES), key="pair_measure",
+                                   index=list(CROSSTAB_MEASURES).index(default_measure))
+        
+        table = load_crosstab(data_version, pair_row, pair_column, cube)
+        values = getattr(table, CROSSTAB_MEASURES[measure])()
+        statistic, dof = table.chi_square()
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Responses", f"{table.total:,}")
+        with col2:
+            st.metric("Chi-square", f"{statistic:,.1f}", help=f"{dof} degrees of freedom")
+        with col3:
+            st.metric("Cramér's V", f"{table.cramers_v():.3f}")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            fig_pair_bars = cached_figure(data_version, 'pair_bars', lambda: pair_bars(values, measure),
+                                          (pair_row, pair_column, measure))
+            show_chart('pair_bars', fig_pair_bars)
+        
+        with col2:
+            fig_pair_heatmap = cached_figure(data_version, 'pair_heatmap', lambda: pair_heatmap(values, measure),
+                                             (pair_row, pair_column, measure))
+            show_chart('pair_heatmap', fig_pair_heatmap)
+        
+        st.write("**Study Location Preference**")
+        fig_loc = cached_figure(data_version, 'loc', lambda: count_chart(cube, 'loc'))
+        show_chart('loc', fig_loc)
+
+with tab3:
+    if tab3.open is not False:
+        st.subheader("Screen Time Insights")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Hours Spent on Screens**")
+            fig_screen = cached_figure(data_version, 'screen', lambda: count_chart(cube, 'screen'))
+            show_chart('screen', fig_screen)
+        
+        with col2:
+            st.write("**Study App Preferences**")
+            fig_app = cached_figure(data_version, 'app', lambda: count_chart(cube, 'app'))
+            show_chart('app', fig_app)
+
+with tab4:
+    if tab4.open is not False:
+        st.subheader("Study Habits")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Break Frequency During Study**")
+            fig_breaks = cached_figure(data_version, 'breaks', lambda: count_chart(cube, 'breaks'))
+            show_chart('breaks', fig_breaks)
+        
+        with col2:
+            st.write("**Note-Taking Methods**")
+            fig_notes = cached_figure(data_version, 'notes', lambda: count_chart(cube, 'notes'))
+            show_chart('notes', fig_notes)
+
+with tab5:
+    if tab5.open is not False:
+        st.subheader("Sleep Analysis")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Sleep Hours Distribution**")
+            fig_sleep = cached_figure(data_version, 'sleep', lambda: count_chart(cube, 'sleep'))
+            show_chart('sleep', fig_sleep)
+        
+        with col2:
+            st.write("**Focus Level Distribution**")
+            fig_focus = cached_figure(data_version, 'focus', lambda: count_chart(cube, 'focus'))
+            show_chart('focus', fig_focus)
@@ -0,0 +1,127 @@
+import streamlit as st
+import pandas as pd
+
+from dashboard import changelog, config, profiler
+from dashboard.exports import excel_available, export_file, export_key
+from dashboard.refresh import current_data, refresh_now
+from dashboard.service import load_filter_index
+from dashboard.widgets import show_dataframe, table_window
+
+df, data_version, data_lineage = current_data()
+filter_index = load_filter_index(data_version, df)
+
+st.title("📝 Raw Data Editor")
+st.write("---")
+
+try:
+    st.subheader("Edit Dataset Directly")
+    st.info("You can add new rows and edit existing data. Save to keep your changes for everyone.")
+    orphaned = changelog.orphaned_changes(data_lineage)
+    if orphaned:
+        st.warning(f"{orphaned} saved changes were made against an earlier copy of the export whose "
+                   "responses have since been rewritten or removed, so they are no longer applied.")
+    
+    with st.expander("Filter rows"):
+        filter_col = st.selectbox("Column", ["(none)"] + list(filter_index.labels), key="editor_filter_col")
+        filter_values = [] if filter_col == "(none)" else st.multiselect(
+            "Values", filter_index.options(filter_col), key="editor_filter_values"
+        )
+    editor_rows = filter_index.rows({filter_col: filter_values}) if filter_values else None
+    
+    # Only the current page is sent to the editor
+    page_rows = table_window(df, data_version, "editor", editor_rows)
+    page_df = df.take(page_rows)
+    
+    # Bumping the generation gives the editor a fresh key, discarding unsaved edits;
+    # the key also follows the page, so edits are positional within one page
+    editor_key = f"data_editor_{st.session_state.get('editor_generation', 0)}_{hash(page_rows.tobytes())}"
+    
+    # Data editor with editable rows; the index holds each row's id in the change log
+    with profiler.section("data_editor"):
+        st.data_editor(  # type: ignore
+            page_df,
+            use_container_width=True,
+            num_rows="dynamic",
+            key=editor_key
+        )
+    profiler.payload('data_editor', 'editor', lambda: profiler.arrow_nbytes(page_df))
+    editor_state = st.session_state.get(editor_key) or {}
+    edits, adds, deletes = changelog.editor_changes(page_df.index, editor_state)
+    pending = len(edits) + len(adds) + len(deletes)
+    next_row_id = changelog.next_row_id(df.index)
+    if pending:
+        st.caption("Save your changes before switching pages, sorting or filtering.")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("💾 Save Changes", disabled=not pending):
+            changelog.append_changes(data_lineage, edits, adds, deletes)
+            changelog.compact_if_needed(data_lineage, config.CHANGELOG_COMPACT_RECORDS)
+            # Swap in the edited dataset before rerunning so the saved changes show
+            refresh_now()
+            st.session_state['editor_generation'] = st.session_state.get('editor_generation', 0) + 1
+            st.rerun()
+    
+    with col2:
+        if st.button("🔄 Reset to Original"):
+            st.session_state['editor_generation'] = st.session_state.get('editor_generation', 0) + 1
+            st.rerun()
+    
+    def edited_data():
+        # Full dataset with this page's unsaved edits applied; only built for a download
+        return changelog.apply_changes(df, changelog.as_records(edits, adds, deletes, next_row_id))
+    
+    st.write("---")
+    st.subheader("Data Export Options")
+    
+    # Exports are built only when a button is clicked, keyed by the changes by row id
+    # (the editor state holds positions within the current page)
+    edits_key = export_key(data_version, edits, adds, deletes)
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.download_button(
+            label="📥 Download CSV",
+            data=lambda: export_file(edited_data(), 'csv', f'edited-{edits_key}'),
+            file_name="edited_data.csv",
+            mime="text/csv"
+        )
+    
+    with col2:
+        if excel_available():
+            st.download_button(
+                label="📥 Download Excel",
+                data=lambda: export_file(edited_data(), 'xlsx', f'edited-{edits_key}'),
+                file_name="edited_data.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+        else:
+            st.write("Excel export requires openpyxl: pip install openpyxl")
+    
+    with col3:
+        st.download_button(
+            label="📥 Download Parquet",
+            data=lambda: export_file(edited_data(), 'parquet', f'edited-{edits_key}'),
+            file_name="edited_data.parquet",
+            mime="application/vnd.apache.parquet"
+        )
+    
+    st.write("---")
+    st.subheader("Edited Data Summary")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Rows", len(df) + len(adds) - len(deletes))
+    with col2:
+        st.metric("Total Columns", len(df.columns))
+    with col3:
+        st.metric("Unsaved Changes", pending)
+    
+    # Show data types
+    st.write("**Data Types:**")
+    show_dataframe('dtypes', pd.DataFrame(df.dtypes.astype(str), columns=['Data Type']))
+    
+except Exception as e:
+    st.error(f"Error in Data Editor: {str(e)}")
+    st.info("Please refresh the page to reload data.")
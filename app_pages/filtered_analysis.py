@@ -0,0 +1,126 @@
+import streamlit as st
+
+from dashboard import schema
+from dashboard.charts import FILTER_COLUMNS, count_chart, default_filters
+from dashboard.exports import export_file, export_key
+from dashboard.figures import freeze
+from dashboard.refresh import current_data
+from dashboard.service import cached_figure, load_cube, load_filter_index, load_summary
+from dashboard.widgets import show_chart, show_dataframe, table_window
+
+df, data_version, _ = current_data()
+cube = load_cube(data_version, df)
+filter_index = load_filter_index(data_version, df)
+
+st.title("🔍 Filtered Analysis")
+st.write("---")
+
+try:
+    st.subheader("Apply Filters")
+    
+    # One multiselect per filter column, all answers selected by default; the
+    # defaults are shared with the cache warm-up, so the first view is already built
+    filter_labels = {
+        schema.AGE: "Filter by Age Group",
+        schema.SCREEN_TIME: "Filter by Screen Time",
+        schema.DEVICE: "Filter by Device",
+    }
+    defaults = default_filters(cube)
+    filters = {}
+    for col, column in zip(st.columns(len(FILTER_COLUMNS)), FILTER_COLUMNS):
+        with col:
+            filters[column] = st.multiselect(
+                filter_labels[column],
+                options=cube.options(column),
+                default=defaults[column]
+            )
+    # Apply filters; only row positions are kept, the frame is sliced for display
+    filtered_rows = filter_index.rows(filters)
+    filtered_count = len(filtered_rows)
+    # All headline numbers of the selection in one pass over the cube
+    summary = load_summary(data_version, filters, cube, df)
+    
+    st.write("---")
+    st.subheader(f"Filtered Results ({filtered_count} records)")
+    
+    if filtered_count > 0:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            avg_focus = summary.focus_mean
+            st.metric("Average Focus Level", f"{avg_focus:.2f}/5" if avg_focus is not None else "n/a")
+        
+        with col2:
+            most_common_loc = summary.modes['Where do you usually study?']
+            st.metric("Most Common Study Location", most_common_loc)
+        
+        with col3:
+            avg_sleep_counts = summary.modes['How many hours of sleep do you usually get on school nights?']
+            st.metric("Most Common Sleep Duration", avg_sleep_counts)
+        
+        st.write("---")
+        st.subheader("Filtered Data Visualizations")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Study Hours Distribution (Filtered)**")
+            fig_study_filtered = cached_figure(data_version, 'filtered_study', lambda: count_chart(cube, 'filtered_study', filters), filters)
+            show_chart('filtered_study', fig_study_filtered)
+        
+        with col2:
+            st.write("**Sleep Hours Distribution (Filtered)**")
+            fig_sleep_filtered = cached_figure(data_version, 'filtered_sleep', lambda: count_chart(cube, 'filtered_sleep', filters), filters)
+            show_chart('filtered_sleep', fig_sleep_filtered)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("**Break Frequency (Filtered)**")
+            break_dist = cube.value_counts('How often do you take breaks while studying?', filters)
+            if break_dist.empty:
+                st.write("No break frequency data available for the selected filters.")
+            else:
+                fig_break = cached_figure(data_version, 'filtered_break', lambda: count_chart(cube, 'filtered_break', filters), filters)
+                show_chart('filtered_break', fig_break)
+        
+        with col2:
+            st.write("**Note-Taking Methods (Filtered)**")
+            fig_notes = cached_figure(data_version, 'filtered_notes', lambda: count_chart(cube, 'filtered_notes', filters), filters)
+            show_chart('filtered_notes', fig_notes)
+        
+        st.write("---")
+        st.subheader("Filtered Dataset")
+        page_rows = table_window(df, data_version, "filtered", filtered_rows)
+        show_dataframe('filtered', df.take(page_rows))
+        
+        # Download filtered data; the file is written only when requested
+        filters_key = export_key(data_version, freeze(filters))
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.download_button(
+                label="📥 Download Filtered Data as CSV",
+                data=lambda: export_file(df, 'csv', f'filtered-{filters_key}', rows=filtered_rows),
+                file_name="filtered_data.csv",
+                mime="text/csv"
+            )
+        with col2:
+            st.download_button(
+                label="📥 Download Filtered Data as Parquet",
+                data=lambda: export_file(df, 'parquet', f'filtered-{filters_key}', rows=filtered_rows),
+                file_name="filtered_data.parquet",
+                mime="application/vnd.apache.parquet"
+            )
+        with col3:
+            st.download_button(
+                label="📥 Download Filtered Summary as JSON",
+                data=lambda: summary.to_json(),
+                file_name="filtered_summary.json",
+                mime="application/json"
+            )
+    else:
+        st.warning("No records match the selected filters. Please adjust your filter criteria.")
+        
+except Exception as e:
+    st.error(f"Error in Filtered Analysis: {str(e)}")
+    st.info("Please check your filter selections and try again.")
@@ -0,0 +1,54 @@
+import time
+
+import streamlit as st
+
+from dashboard import warmup
+from dashboard.refresh import current_data, load_refresher
+from dashboard.service import load_cube, load_summary
+from dashboard.widgets import show_dataframe
+
+df, data_version, _ = current_data()
+# Headline numbers from the cached summary instead of scanning the columns
+summary = load_summary(data_version, None, load_cube(data_version, df), df)
+
+st.title("📊 Student Screen Time & Study Habits Dashboard")
+
+# Background refresh: the served version keeps being shown while a newer one is prepared
+refresher = load_refresher()
+status = refresher.status
+if status.state == warmup.RUNNING and status.version == data_version:
+    st.info(f"⏳ Preparing charts for dataset {data_version}: {status.done}/{status.total} ({status.step})")
+elif status.state == warmup.RUNNING:
+    st.info(f"⏳ Preparing the latest data in the background, showing dataset {data_version} meanwhile: "
+            f"{status.done}/{status.total} ({status.step})")
+elif status.state == warmup.FAILED:
+    st.warning(f"Refreshing the data failed, still showing dataset {data_version}: {status.error}")
+else:
+    checked = time.strftime('%H:%M:%S', time.localtime(refresher.checked_at))
+    st.caption(f"✅ Dataset {data_version}, checked for new data at {checked}")
+st.write("---")
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("Total Responses", summary.responses)
+with col2:
+    st.metric("Age Groups", summary.distinct['What is your age?'])
+with col3:
+    st.metric("Dataset Columns", len(summary.columns))
+
+st.write("---")
+st.subheader("📝 Dataset Overview")
+st.write(f"**Shape:** {summary.responses} rows × {len(summary.columns)} columns")
+show_dataframe('preview', df.head(10))
+
+st.write("---")
+st.subheader("📋 Column Information")
+for col, dtype in summary.columns:
+    st.write(f"**{col}:** {dtype}")
+
+st.download_button(
+    label="📥 Download Summary as JSON",
+    data=lambda: summary.to_json(),
+    file_name="summary.json",
+    mime="application/json"
+)
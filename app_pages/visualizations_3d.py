@@ -0,0 +1,66 @@
+import streamlit as st
+
+from dashboard import config
+from dashboard.charts import DEFAULT_CUSTOM_AXES, custom_scatter3d, fixed_scatter3d
+from dashboard.scatter3d import AGGREGATED, POINT_MODES
+from dashboard.refresh import current_data
+from dashboard.service import cached_figure, load_features
+from dashboard.widgets import show_chart
+
+df, data_version, _ = current_data()
+
+st.title("🎯 3D Visualizations")
+st.write("---")
+
+try:
+    # Encoded axis features, built once per dataset version
+    features = load_features(data_version, df)
+    
+    point_mode = st.radio(
+        "Point mode",
+        POINT_MODES,
+        index=POINT_MODES.index(AGGREGATED),
+        horizontal=True,
+        help="Aggregated draws one marker per distinct answer combination, sized and colored by count."
+    )
+    if point_mode != AGGREGATED and features.n_rows > config.SCATTER3D_MAX_POINTS:
+        st.caption(f"Showing a random sample of {config.SCATTER3D_MAX_POINTS:,} of {features.n_rows:,} responses.")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Age vs Screen Time vs Focus Level")
+        
+        fig_3d_1 = cached_figure(data_version, '3d_age_screen_focus',
+                                 lambda: fixed_scatter3d(features, '3d_age_screen_focus', point_mode), point_mode)
+        show_chart('3d_age_screen_focus', fig_3d_1)
+    
+    with col2:
+        st.subheader("Screen Time vs Study Hours vs Focus Level")
+        
+        fig_3d_2 = cached_figure(data_version, '3d_screen_study_focus',
+                                 lambda: fixed_scatter3d(features, '3d_screen_study_focus', point_mode), point_mode)
+        show_chart('3d_screen_study_focus', fig_3d_2)
+    
+    st.write("---")
+    st.subheader("Custom 3D Visualization")
+    st.write("Select axes to create your own 3D visualization:")
+    
+    # Defaults shared with the cache warm-up, so the first view is already built
+    default_x, default_y, default_z = DEFAULT_CUSTOM_AXES
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        x_axis = st.selectbox("Select X-axis", features.names, index=features.names.index(default_x))
+    with col2:
+        y_axis = st.selectbox("Select Y-axis", features.names, index=features.names.index(default_y))
+    with col3:
+        z_axis = st.selectbox("Select Z-axis", features.names, index=features.names.index(default_z))
+    
+    fig_3d_custom = cached_figure(data_version, '3d_custom',
+                                  lambda: custom_scatter3d(features, point_mode, (x_axis, y_axis, z_axis)),
+                                  (point_mode, x_axis, y_axis, z_axis))
+    show_chart('3d_custom', fig_3d_custom)
+    
+except Exception as e:
+    st.error(f"Error creating 3D visualizations: {str(e)}")
+    st.info("Please check that your data is loaded correctly.")
@@ -0,0 +1,187 @@
+"""Headless benchmark of the dashboard pages on synthetic survey exports.
+
+    python benchmarks/run.py --rows 1000 100000 1000000 --output bench.jsonl
+    python benchmarks/run.py --rows 100000 --baseline bench.jsonl --max-slowdown 1.25
+
+For each size a synthetic export is generated with ``dashboard.synthetic`` (and
+kept under ``--workdir`` for later runs). A fresh Python process then drives
+home.py through Streamlit's AppTest: a cold start on an empty cache, a warm
+start on the cache it left behind, then every page ``--runs`` times. Each
+measurement records the median rerun wall time, the peak traced memory of one
+extra rerun under ``tracemalloc`` and the serialized size of everything the
+rerun rendered.
+
+Results are written as JSON lines. With ``--baseline`` the exit status is 1 if
+any (rows, phase) got slower than the baseline by more than ``--max-slowdown``.
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Page title -> page script registered with st.navigation in home.py
+PAGES = {
+    "Home": "app_pages/home.py",
+    "Analytics": "app_pages/analytics.py",
+    "3D Visualizations": "app_pages/visualizations_3d.py",
+    "Raw Data Editor": "app_pages/data_editor.py",
+    "Filtered Analysis": "app_pages/filtered_analysis.py",
+}
+
+
+def select_page(at, page):
+    at.switch_page(PAGES[page])
+
+
+def payload_bytes(node):
+    """Serialized protobuf size of every element under an AppTest node."""
+    proto = getattr(node, 'proto', None)
+    size = proto.ByteSize() if hasattr(proto, 'ByteSize') else 0
+    return size + sum(payload_bytes(child) for child in getattr(node, 'children', {}).values())
+
+
+def measure(at, runs, step=None, traced=True):
+    """Rerun ``at`` (after ``step``) ``runs`` times, plus once under ``tracemalloc`` if ``traced``.
+
+    ``max_rss_bytes`` is the process's peak resident memory so far, which for a
+    cold start is the cost of loading the dataset.
+    """
+    times = []
+    for _ in range(runs):
+        if step:
+            step(at)
+        started = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - started)
+        if at.exception:
+            return {'error': str(at.exception[0].value)}
+
+    result = {'seconds': statistics.median(times)}
+    if traced:
+        if step:
+            step(at)
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        at.run()
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+    result['max_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    result['payload_bytes'] = payload_bytes(at._tree)
+    return result
+
+
+def worker(args):
+    """Benchmark one export in this process and print one JSON line per phase."""
+    from streamlit.testing.v1 import AppTest
+
+    def report(phase, result):
+        print(json.dumps({'rows': args.rows, 'phase': phase, **result}), flush=True)
+
+    def app():
+        return AppTest.from_file(str(ROOT / 'home.py'), default_timeout=args.timeout)
+
+    if args.cold:
+        report('cold_start', measure(app(), 1, traced=False))
+        return
+    at = app()
+    report('warm_start', measure(at, 1))
+    for page in PAGES:
+        report(f'page:{page}', measure(at, args.runs, lambda at: select_page(at, page)))
+
+
+def run_size(rows, args):
+    from dashboard import synthetic
+
+    workdir = Path(args.workdir)
+    data = workdir / f'responses-{rows}.csv'
+    if not data.exists():
+        workdir.mkdir(parents=True, exist_ok=True)
+        synthetic.write_csv(data, rows)
+    cache_dir = workdir / f'cache-{rows}'
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+    env = dict(os.environ, DASHBOARD_DATA_PATH=str(data), DASHBOARD_CACHE_DIR=str(cache_dir),
+               DASHBOARD_CHANGELOG_PATH=str(cache_dir / 'changes.sqlite'), DASHBOARD_PROFILE='0',
+               DASHBOARD_WARMUP='1' if args.warmup else '0')
+    results = []
+    # The cold start gets its own process so no in-process cache is warm
+    for extra in (['--cold'], []):
+        command = [sys.executable, __file__, '--worker', '--rows', str(rows), '--runs', str(args.runs),
+                   '--timeout', str(args.timeout)] + extra
+        output = subprocess.run(command, env=env, stdout=subprocess.PIPE, check=True, text=True).stdout
+        results += [json.loads(line) for line in output.splitlines() if line.startswith('{')]
+    return results
+
+
+def compare(results, baseline_path, max_slowdown):
+    """Return (rows, phase, seconds, baseline seconds) for every regression."""
+    baseline = {}
+    with open(baseline_path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            baseline[(record['rows'], record['phase'])] = record.get('seconds')
+    regressions = []
+    for record in results:
+        before = baseline.get((record['rows'], record['phase']))
+        if before and record.get('seconds') and record['seconds'] > before * max_slowdown:
+            regressions.append((record['rows'], record['phase'], record['seconds'], before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10_000, 100_000])
+    parser.add_argument('--runs', type=int, default=3, help='timed reruns per page')
+    parser.add_argument('--timeout', type=float, default=600, help='seconds allowed per rerun')
+    parser.add_argument('--workdir', default=str(ROOT / '.cache' / 'benchmarks'))
+    parser.add_argument('--output', help='JSON-lines file for the results')
+    parser.add_argument('--baseline', help='earlier --output file to compare against')
+    parser.add_argument('--max-slowdown', type=float, default=1.25)
+    parser.add_argument('--warmup', action='store_true',
+                        help='keep the background cache warm-up on (off by default so pages are timed cold)')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--cold', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        args.rows = args.rows[0]
+        worker(args)
+        return 0
+
+    results = []
+    for rows in args.rows:
+        for record in run_size(rows, args):
+            results.append(record)
+            if 'error' in record:
+                print(f"{rows:>10,} {record['phase']:<30} ERROR {record['error']}")
+            else:
+                peak = f"{record['peak_bytes'] / 1024 ** 2:,.1f}" if 'peak_bytes' in record else '-'
+                print(f"{rows:>10,} {record['phase']:<30} {record['seconds'] * 1000:>9,.0f} ms "
+                      f"{peak:>8} MB peak {record['max_rss_bytes'] / 1024 ** 2:>8,.0f} MB RSS "
+                      f"{record['payload_bytes'] / 1024:>9,.1f} KB")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(record) + '\n' for record in results)
+
+    failed = any('error' in record for record in results)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.max_slowdown)
+        for rows, phase, seconds, before in regressions:
+            print(f'Regression: {rows:,} rows, {phase}: {seconds * 1000:,.0f} ms vs {before * 1000:,.0f} ms')
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Data and rendering helpers for the Student Study Dashboard (home.py)."""
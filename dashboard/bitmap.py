@@ -0,0 +1,62 @@
+"""Inverted bitmap index for filtering responses by answer.
+
+Each (column, answer) pair maps to a packed bitmap with one bit per response.
+A filter ORs the bitmaps of the selected answers within a column and ANDs the
+columns together, producing row positions without building boolean masks over
+the DataFrame.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from dashboard.cube import CUBE_COLUMNS, NO_ANSWER, encode_column
+
+
+@dataclass
+class BitmapIndex:
+    n_rows: int
+    labels: dict = field(default_factory=dict)
+    # column -> uint8 array of shape (len(labels[column]) + 1, ceil(n_rows / 8));
+    # the last bitmap marks the responses that left the column blank
+    bitmaps: dict = field(default_factory=dict)
+
+    def options(self, column):
+        """Filter options of ``column``: its answer labels in category order, then
+        ``NO_ANSWER`` if some responses left it blank."""
+        missing = self.bitmaps[column][-1].any()
+        return list(self.labels[column]) + ([NO_ANSWER] if missing else [])
+
+    def select(self, filters=None):
+        """Packed bitmap of the responses matching ``filters`` ({column: selected labels})."""
+        result = np.packbits(np.ones(self.n_rows, dtype=bool))
+        for column, selected in (filters or {}).items():
+            selected = set(selected)
+            wanted = [i for i, label in enumerate(self.labels[column]) if label in selected]
+            if NO_ANSWER in selected:
+                wanted.append(len(self.labels[column]))
+            column_bits = np.bitwise_or.reduce(self.bitmaps[column][wanted], axis=0) if wanted \
+                else np.zeros_like(result)
+            result &= column_bits
+        return result
+
+    def rows(self, filters=None):
+        """Row positions (ascending) of the responses matching ``filters``."""
+        return np.flatnonzero(np.unpackbits(self.select(filters), count=self.n_rows))
+
+    def count(self, filters=None):
+        """Number of responses matching ``filters``."""
+        return int(np.bitwise_count(self.select(filters)).sum())
+
+
+def build_index(df, columns=None):
+    """Build a ``BitmapIndex`` over ``columns`` (default ``CUBE_COLUMNS``)."""
+    index = BitmapIndex(len(df))
+    for col in columns or CUBE_COLUMNS:
+        if col not in df.columns:
+            continue
+        codes, labels = encode_column(df[col])
+        index.labels[col] = labels
+        index.bitmaps[col] = np.stack([np.packbits(codes == i) for i in range(len(labels))]
+                                      + [np.packbits(codes < 0)])
+    return index
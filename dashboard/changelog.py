@@ -0,0 +1,266 @@
+"""Append-only change log for edits made in the Raw Data Editor.
+
+Edits are stored as row-level records (edit, add, delete) in a SQLite file next
+to the survey export, tagged with the dataset lineage they were made against
+(see ``dashboard.ingest.lineage``). The dashboard's dataset is the base snapshot
+with the log applied on top, so saving a handful of edits writes a handful of
+rows instead of the whole file. Row ids are positions in the base snapshot;
+rows added in the editor get ids from ``ADDED_ROW_IDS`` up, so responses
+appended to the export later never collide with them. For each lineage with
+records the log also keeps how its rows were read from the export (see
+``dashboard.ingest.lineage_source``), so a rebuilt cache serves the same
+lineage and the records keep applying.
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from dashboard import config
+
+EDIT, ADD, DELETE = 'edit', 'add', 'delete'
+
+ADDED_ROW_IDS = 1 << 40
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    version TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT,
+    created_at REAL NOT NULL
+)
+"""
+
+_LINEAGES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lineages (
+    version TEXT PRIMARY KEY,
+    source TEXT NOT NULL
+)
+"""
+
+
+def changelog_path():
+    if config.CHANGELOG_PATH:
+        return Path(config.CHANGELOG_PATH)
+    data_path = Path(config.DATA_PATH)
+    return data_path.with_name(data_path.stem + '.changes.sqlite')
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute(_SCHEMA)
+    conn.execute(_LINEAGES_SCHEMA)
+    return conn
+
+
+def head(path=None):
+    """Sequence number of the latest change, 0 if there are none; keys caches of the merged view."""
+    path = Path(path or changelog_path())
+    if not path.exists():
+        return 0
+    with closing(_connect(path)) as conn:
+        return conn.execute('SELECT COALESCE(MAX(seq), 0) FROM changes').fetchone()[0]
+
+
+def read_changes(version, path=None):
+    """(row_id, op, values) records for ``version`` in the order they were made."""
+    path = Path(path or changelog_path())
+    if not path.exists():
+        return []
+    with closing(_connect(path)) as conn:
+        rows = conn.execute(
+            'SELECT row_id, op, payload FROM changes WHERE version = ? ORDER BY seq', (version,)
+        ).fetchall()
+    return [(row_id, op, json.loads(payload) if payload else None) for row_id, op, payload in rows]
+
+
+def save_lineage(version, source, path=None):
+    """Remember how ``version``'s rows were read (an ``ingest.lineage_source`` result)."""
+    path = Path(path or changelog_path())
+    if source is None or not path.exists():
+        return
+    with closing(_connect(path)) as conn:
+        conn.execute('INSERT OR REPLACE INTO lineages (version, source) VALUES (?, ?)',
+                     (version, json.dumps(source)))
+
+
+def known_lineages(path=None):
+    """``ingest.lineage_source`` results of the lineages that have change records."""
+    path = Path(path or changelog_path())
+    if not path.exists():
+        return []
+    with closing(_connect(path)) as conn:
+        rows = conn.execute(
+            'SELECT source FROM lineages WHERE version IN (SELECT DISTINCT version FROM changes)'
+        ).fetchall()
+    return [json.loads(source) for source, in rows]
+
+
+def orphaned_changes(version, path=None):
+    """Number of change records made against lineages other than ``version``, which are not applied."""
+    path = Path(path or changelog_path())
+    if not path.exists():
+        return 0
+    with closing(_connect(path)) as conn:
+        return conn.execute('SELECT COUNT(*) FROM changes WHERE version != ?', (version,)).fetchone()[0]
+
+
+def fold(records):
+    """Collapse records to one final state per row.
+
+    Returns {row_id: (op, values)}: ``add`` rows carry all their values,
+    ``edit`` rows only the changed columns and ``delete`` rows ``None``. Rows
+    added and deleted again disappear.
+    """
+    state = {}
+    for row_id, op, values in records:
+        previous = state.get(row_id)
+        if op == DELETE:
+            if previous is not None and previous[0] == ADD:
+                del state[row_id]
+            else:
+                state[row_id] = (DELETE, None)
+        elif op == ADD:
+            state[row_id] = (ADD, dict(values))
+        elif previous is not None and previous[0] != DELETE:
+            state[row_id] = (previous[0], {**previous[1], **values})
+        else:
+            state[row_id] = (EDIT, dict(values))
+    return state
+
+
+def editor_changes(index, editor_state):
+    """Translate ``st.data_editor`` state into (edits, adds, deletes) keyed by row id.
+
+    ``index`` is the index of the frame shown in the editor; the editor reports
+    edited and deleted rows by position within it.
+    """
+    edits = {int(index[int(pos)]): values for pos, values in editor_state.get('edited_rows', {}).items()}
+    adds = list(editor_state.get('added_rows', []))
+    deletes = [int(index[int(pos)]) for pos in editor_state.get('deleted_rows', [])]
+    return edits, adds, deletes
+
+
+def next_row_id(index):
+    """Id for the next row added in the editor, given the index of the merged view."""
+    return max(ADDED_ROW_IDS, int(index.max()) + 1) if len(index) else ADDED_ROW_IDS
+
+
+def as_records(edits, adds, deletes, first_new_id):
+    """(row_id, op, values) records for editor changes, numbering added rows from ``first_new_id``."""
+    records = [(row_id, EDIT, values) for row_id, values in edits.items()]
+    records += [(first_new_id + i, ADD, values) for i, values in enumerate(adds)]
+    records += [(row_id, DELETE, None) for row_id in deletes]
+    return records
+
+
+def append_changes(version, edits=None, adds=None, deletes=None, path=None):
+    """Append editor changes in one transaction and return the new head.
+
+    ``edits`` maps row id -> {column: value}, ``adds`` is a list of
+    {column: value} dicts and ``deletes`` a list of row ids. Added rows are
+    numbered after the last added row in the log.
+    """
+    path = Path(path or changelog_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    with closing(_connect(path)) as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            last_id = conn.execute(
+                'SELECT MAX(row_id) FROM changes WHERE version = ? AND row_id >= ?', (version, ADDED_ROW_IDS)
+            ).fetchone()[0]
+            next_id = ADDED_ROW_IDS if last_id is None else last_id + 1
+            records = as_records(edits or {}, adds or [], deletes or [], next_id)
+            conn.executemany(
+                'INSERT INTO changes (version, row_id, op, payload, created_at) VALUES (?, ?, ?, ?, ?)',
+                [(version, int(row_id), op, json.dumps(values, default=str) if values is not None else None, now)
+                 for row_id, op, values in records]
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return conn.execute('SELECT COALESCE(MAX(seq), 0) FROM changes').fetchone()[0]
+
+
+def compact(version, path=None):
+    """Rewrite ``version``'s records as one record per changed row; returns the record count."""
+    path = Path(path or changelog_path())
+    if not path.exists():
+        return 0
+    with closing(_connect(path)) as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                'SELECT row_id, op, payload FROM changes WHERE version = ? ORDER BY seq', (version,)
+            ).fetchall()
+            state = fold((row_id, op, json.loads(payload) if payload else None) for row_id, op, payload in rows)
+            conn.execute('DELETE FROM changes WHERE version = ?', (version,))
+            conn.executemany(
+                'INSERT INTO changes (version, row_id, op, payload, created_at) VALUES (?, ?, ?, ?, ?)',
+                [(version, row_id, op, json.dumps(values, default=str) if values is not None else None, time.time())
+                 for row_id, (op, values) in sorted(state.items())]
+            )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+    return len(state)
+
+
+def compact_if_needed(version, max_records, path=None):
+    """Compact ``version``'s records once there are more than ``max_records`` of them
+    and at least twice as many as changed rows."""
+    path = Path(path or changelog_path())
+    if not path.exists():
+        return False
+    with closing(_connect(path)) as conn:
+        n_records, n_rows = conn.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT row_id) FROM changes WHERE version = ?', (version,)
+        ).fetchone()
+    if n_records <= max_records or n_records < 2 * n_rows:
+        return False
+    compact(version, path)
+    return True
+
+
+def _fit_categories(series, values):
+    """Extend a categorical's categories with any new values about to be written into it."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    new = [v for v in dict.fromkeys(values) if v is not None and v not in series.cat.categories]
+    return series.cat.add_categories(new) if new else series
+
+
+def apply_changes(df, records):
+    """Return ``df`` (indexed by base row id) with the change records applied."""
+    state = fold(records)
+    if not state:
+        return df
+
+    # Shallow copy: ``df`` may be read-only shared memory, so only columns being
+    # written to are copied below
+    merged = df.copy(deep=False)
+    deleted = [row_id for row_id, (op, _) in state.items() if op == DELETE and row_id in merged.index]
+    edited = {row_id: values for row_id, (op, values) in state.items() if op == EDIT and row_id in merged.index}
+    added = {row_id: values for row_id, (op, values) in state.items() if op == ADD}
+
+    columns = {col for values in list(edited.values()) + list(added.values()) for col in values}
+    for col in columns & set(merged.columns):
+        merged[col] = _fit_categories(merged[col].copy(), [v.get(col) for v in list(edited.values()) + list(added.values())])
+    for row_id, values in edited.items():
+        for col, value in values.items():
+            if col in merged.columns:
+                merged.at[row_id, col] = value
+    if added:
+        new_rows = pd.DataFrame.from_dict(added, orient='index').reindex(columns=merged.columns)
+        new_rows = new_rows.astype(merged.dtypes.to_dict(), errors='ignore')
+        merged = pd.concat([merged, new_rows])
+    return merged.drop(index=deleted)
@@ -0,0 +1,131 @@
+"""Figure builders shared by the pages and the cache warm-up.
+
+Each chart the pages draw is built here from the pre-aggregated structures
+(count cube, crosstabs, encoded features), so ``dashboard.warmup`` can build
+the figures a page shows by default under the same chart ids and widget state
+before any session asks for them.
+"""
+
+import plotly.express as px  # type: ignore
+import plotly.graph_objects as go  # type: ignore
+
+from dashboard import config, schema
+from dashboard.scatter3d import AGGREGATED, scatter3d_trace
+
+# Answer-count charts: chart id -> (column, 'pie' or 'bar', title, x-axis label)
+COUNT_CHARTS = {
+    'age': (schema.AGE, 'pie', "Student Age Groups", None),
+    'device': (schema.DEVICE, 'bar', "Most Used Devices", 'Device'),
+    'study': (schema.STUDY_HOURS, 'bar', "Daily Study Hours", 'Hours'),
+    'loc': (schema.LOCATION, 'pie', "Study Locations", None),
+    'screen': (schema.SCREEN_TIME, 'bar', "Daily Screen Time Distribution", 'Screen Time'),
+    'app': (schema.APP, 'pie', "Most Used Study Apps", None),
+    'breaks': (schema.BREAKS, 'bar', "Break Taking Frequency", 'Break Frequency'),
+    'notes': (schema.NOTES, 'bar', "Note-Taking Methods", 'Method'),
+    'sleep': (schema.SLEEP, 'bar', "Sleep Hours on School Nights", 'Hours'),
+    'focus': (schema.FOCUS, 'bar', "Focus Level When Studying", 'Focus Level (1-5)'),
+    'filtered_study': (schema.STUDY_HOURS, 'bar', "Study Hours (Filtered)", 'Hours'),
+    'filtered_sleep': (schema.SLEEP, 'bar', "Sleep Hours (Filtered)", 'Hours'),
+    'filtered_break': (schema.BREAKS, 'pie', "Break Frequency (Filtered)", None),
+    'filtered_notes': (schema.NOTES, 'pie', "Note-Taking Methods", None),
+}
+
+# Columns filtered on the Filtered Analysis page, all answers selected by default
+FILTER_COLUMNS = [schema.AGE, schema.SCREEN_TIME, schema.DEVICE]
+
+# Default question pair and measure of the Relationships tab
+DEFAULT_PAIR = (schema.AGE, schema.SCREEN_TIME, "Count")
+
+# Fixed 3D charts: chart id -> (x, y, z features, colorscale, axis titles, title)
+SCATTER3D_CHARTS = {
+    '3d_age_screen_focus': (
+        ('age_code', 'screen_code', 'focus_level'), 'Viridis',
+        ('Age Group', 'Screen Time Category', 'Focus Level'),
+        "3D Scatter: Age × Screen Time × Focus",
+    ),
+    '3d_screen_study_focus': (
+        ('screen_code', 'study_hours_code', 'focus_level'), 'Plasma',
+        ('Screen Time Category', 'Study Hours Category', 'Focus Level'),
+        "3D Scatter: Screen Time × Study Hours × Focus",
+    ),
+}
+
+# Default axes of the custom 3D chart
+DEFAULT_CUSTOM_AXES = ('age_code', 'study_hours_code', 'focus_level')
+
+
+def count_chart(cube, chart_id, filters=None):
+    """Pie or bar chart of the answer counts behind ``chart_id`` in ``COUNT_CHARTS``."""
+    column, kind, title, x_label = COUNT_CHARTS[chart_id]
+    # The focus scale reads best in rating order, other answers by frequency
+    counts = cube.value_counts(column, filters, sort=column != schema.FOCUS)
+    if kind == 'pie':
+        return px.pie(values=counts.values, names=counts.index, title=title)  # type: ignore
+    return px.bar(  # type: ignore
+        x=counts.index, y=counts.values,
+        title=title,
+        labels={'x': x_label, 'y': 'Count'})
+
+
+def default_filters(cube):
+    """The Filtered Analysis filters before the user changes any."""
+    return {column: cube.options(column) for column in FILTER_COLUMNS}
+
+
+def pair_bars(values, measure):
+    """Grouped bars of a crosstab view (rows on x, one bar per column answer)."""
+    return px.bar(  # type: ignore
+        values.stack().rename(measure).reset_index(),
+        x=values.index.name, y=measure, color=values.columns.name,
+        barmode='group',
+        title=f"{measure} by Answer Pair")
+
+
+def pair_heatmap(values, measure):
+    """Heatmap of a crosstab view with the value written in each cell."""
+    return px.imshow(  # type: ignore
+        values, text_auto='.3g', aspect='auto',
+        color_continuous_scale='Blues',
+        title=f"{measure} Heatmap")
+
+
+def scatter3d_figure(features, point_mode, axes, colorscale, titles, title, hovertemplate, height=600):
+    """3D scatter of three encoded features, coloured by focus."""
+    x_axis, y_axis, z_axis = axes
+    fig = go.Figure(data=[scatter3d_trace(  # type: ignore
+        features.column(x_axis), features.column(y_axis), features.column(z_axis),
+        point_mode, colorscale,
+        color=features.column('focus_level'),
+        text=features.text,
+        hovertemplate=hovertemplate,
+        max_points=config.SCATTER3D_MAX_POINTS,
+        labels=tuple(features.labels.get(axis) for axis in axes)
+    )])
+    fig.update_layout(  # type: ignore
+        scene=dict(
+            xaxis_title=titles[0],
+            yaxis_title=titles[1],
+            zaxis_title=titles[2],
+            xaxis=features.axis(x_axis),
+            yaxis=features.axis(y_axis),
+            zaxis=features.axis(z_axis)
+        ),
+        title=title,
+        height=height
+    )
+    return fig
+
+
+def fixed_scatter3d(features, chart_id, point_mode=AGGREGATED):
+    """One of the page's fixed 3D charts, see ``SCATTER3D_CHARTS``."""
+    axes, colorscale, titles, title = SCATTER3D_CHARTS[chart_id]
+    return scatter3d_figure(features, point_mode, axes, colorscale, titles, title,
+                            '<b>%{text}</b><br>Focus: %{z}<extra></extra>')
+
+
+def custom_scatter3d(features, point_mode, axes):
+    """The user-configured 3D chart."""
+    titles = [axis.replace('_', ' ').title() for axis in axes]
+    return scatter3d_figure(features, point_mode, axes, 'RdBu', titles,
+                            f"Custom 3D: {axes[0]} × {axes[1]} × {axes[2]}",
+                            '<b>%{text}</b><extra></extra>', height=700)
@@ -0,0 +1,152 @@
+"""Memory-mapped, read-only column store shared by every server process.
+
+Each dataset version is written once as one file per column under the cache
+directory: NumPy ``.npy`` files for category codes, numbers and nullable-int
+values/masks, and one uncompressed Arrow IPC file for text columns. Opening a
+version maps those files instead of reading them, so all workers and sessions
+share the same pages of the OS page cache, and a new worker starts without
+parsing the CSV or decoding Parquet.
+
+Frames opened from the store are backed by read-only memory; code that needs
+to modify one must copy the columns it changes (see
+``dashboard.changelog.apply_changes``).
+"""
+
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from dashboard import config, ingest
+
+# Dataset versions kept on disk; older ones are removed once a new one is published
+KEEP_VERSIONS = 2
+
+_MASKED_ARRAYS = {'i': pd.arrays.IntegerArray, 'u': pd.arrays.IntegerArray,
+                  'f': pd.arrays.FloatingArray, 'b': pd.arrays.BooleanArray}
+
+
+def _root(path=None, cache_dir=None):
+    return ingest.store_dir(path or config.DATA_PATH, cache_dir or config.CACHE_DIR) / 'columns'
+
+
+def _version_dir(root, version):
+    return root / version.replace('/', '_')
+
+
+def _string_dtype():
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        return pd.StringDtype('pyarrow')
+
+
+def write_columns(df, target):
+    """Write ``df``'s columns under the new directory ``target``."""
+    import pyarrow as pa  # type: ignore
+    import pyarrow.ipc as ipc  # type: ignore
+
+    target.mkdir(parents=True)
+    columns, text = [], {}
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {'name': col}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            np.save(target / f'{i}.codes.npy', series.array.codes)
+            entry.update(kind='category', categories=series.cat.categories.tolist(),
+                         ordered=bool(series.cat.ordered))
+        elif isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and series.dtype.kind in _MASKED_ARRAYS \
+                and hasattr(series.dtype, 'numpy_dtype'):
+            np.save(target / f'{i}.values.npy', series.to_numpy(dtype=series.dtype.numpy_dtype, na_value=0))
+            np.save(target / f'{i}.mask.npy', series.isna().to_numpy())
+            entry.update(kind='masked', dtype=str(series.dtype))
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iufbmM':
+            np.save(target / f'{i}.values.npy', series.to_numpy())
+            entry.update(kind='numpy')
+        else:
+            text[str(i)] = pa.array(series.astype(object), type=pa.large_string(), from_pandas=True)
+            entry.update(kind='text')
+        columns.append(entry)
+
+    if text:
+        table = pa.table(text)
+        with ipc.new_file(target / 'text.arrow', table.schema) as writer:
+            writer.write_table(table)
+    (target / 'meta.json').write_text(json.dumps({'n_rows': len(df), 'columns': columns}))
+
+
+def open_columns(source):
+    """Map a directory written by ``write_columns`` back into a read-only DataFrame."""
+    meta = json.loads((source / 'meta.json').read_text())
+    text = None
+    if (source / 'text.arrow').exists():
+        import pyarrow as pa  # type: ignore
+        import pyarrow.ipc as ipc  # type: ignore
+        text = ipc.open_file(pa.memory_map(str(source / 'text.arrow'))).read_all()
+
+    data = {}
+    for i, entry in enumerate(meta['columns']):
+        kind = entry['kind']
+        if kind == 'category':
+            dtype = pd.CategoricalDtype(entry['categories'], ordered=entry['ordered'])
+            codes = np.load(source / f'{i}.codes.npy', mmap_mode='r')
+            array = pd.Categorical.from_codes(codes, dtype=dtype)
+        elif kind == 'masked':
+            dtype = pd.api.types.pandas_dtype(entry['dtype'])
+            values = np.load(source / f'{i}.values.npy', mmap_mode='r')
+            mask = np.load(source / f'{i}.mask.npy', mmap_mode='r')
+            array = _MASKED_ARRAYS[dtype.kind](values, mask)
+        elif kind == 'numpy':
+            array = np.load(source / f'{i}.values.npy', mmap_mode='r')
+        else:
+            array = pd.arrays.ArrowStringArray(text.column(str(i)), dtype=_string_dtype())
+        data[entry['name']] = pd.Series(array, copy=False)
+    return pd.DataFrame(data, copy=False, index=pd.RangeIndex(meta['n_rows']))
+
+
+def publish(df, version, path=None, cache_dir=None):
+    """Write ``version`` to the store unless another process already has."""
+    root = _root(path, cache_dir)
+    target = _version_dir(root, version)
+    if (target / 'meta.json').exists():
+        return target
+    tmp = root / f'.tmp-{uuid.uuid4().hex}'
+    try:
+        write_columns(df, tmp)
+        os.rename(tmp, target)
+    except OSError:
+        # Lost the race to a concurrent writer; its copy is identical
+        if not (target / 'meta.json').exists():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    # Removing a mapped version is safe: processes still using it keep their mapping
+    versions = sorted((p for p in root.iterdir() if not p.name.startswith('.')),
+                      key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in versions[KEEP_VERSIONS:]:
+        if stale != target:
+            shutil.rmtree(stale, ignore_errors=True)
+    return target
+
+
+def open_dataset(path=None, cache_dir=None, known_lineages=()):
+    """Return the current dataset as a memory-mapped frame plus its version.
+
+    Nothing is parsed when the store already holds the version matching the
+    source files; otherwise ``dashboard.ingest`` brings its Parquet cache up to
+    date (parsing only new responses, keeping one of ``known_lineages`` on a
+    rebuild where it can) and the result is published first.
+    """
+    version = ingest.cached_version(path, cache_dir)
+    target = _version_dir(_root(path, cache_dir), version) if version else None
+    if target is None or not (target / 'meta.json').exists():
+        df, version = ingest.read_survey(path, cache_dir, known_lineages)
+        target = publish(df, version, path, cache_dir)
+    df = open_columns(target)
+    # Later incremental loads append to the mapped frame instead of a private copy
+    ingest.remember_frame(df, version, path, cache_dir)
+    return df, version
@@ -0,0 +1,55 @@
+"""Runtime settings, overridable through environment variables."""
+
+import os
+from pathlib import Path
+
+# Survey export exported from the Google Form
+DATA_PATH = Path(os.environ.get(
+    'DASHBOARD_DATA_PATH',
+    r'd:\downloads\SCREEN TIME AND STUDY HABITS AMONG STUDENTS (Responses) - Form responses 1.csv'
+))
+
+# Directory for the columnar cache and other derived files
+CACHE_DIR = Path(os.environ.get(
+    'DASHBOARD_CACHE_DIR',
+    Path(__file__).resolve().parent.parent / '.cache'
+))
+
+# Byte budget (serialized JSON) of the shared Plotly figure cache
+FIGURE_CACHE_BYTES = int(float(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', 64)) * 1024 * 1024)
+
+# Run only the selected Analytics tab on each rerun instead of all of them
+LAZY_TABS = os.environ.get('DASHBOARD_LAZY_TABS', '1').lower() not in ('0', 'false', 'no')
+
+# Above this many responses the individual-point 3D mode shows a random sample
+SCATTER3D_MAX_POINTS = int(os.environ.get('DASHBOARD_3D_MAX_POINTS', 5000))
+
+# Rows written per chunk by the CSV/Excel/Parquet exports
+EXPORT_CHUNK_ROWS = int(os.environ.get('DASHBOARD_EXPORT_CHUNK_ROWS', 50_000))
+
+# Number of built export files kept on disk for reuse
+EXPORT_CACHE_FILES = int(os.environ.get('DASHBOARD_EXPORT_CACHE_FILES', 32))
+
+# SQLite change log of Raw Data Editor saves; defaults to <export>.changes.sqlite next to DATA_PATH
+CHANGELOG_PATH = os.environ.get('DASHBOARD_CHANGELOG_PATH') or None
+
+# Compact the change log to one record per changed row beyond this many records
+CHANGELOG_COMPACT_RECORDS = int(os.environ.get('DASHBOARD_CHANGELOG_COMPACT_RECORDS', 1000))
+
+# Rows per page offered by the Raw Data Editor and Filtered Analysis tables
+PAGE_SIZES = [25, 50, 100, 250, 500]
+PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', 100))
+
+# Seconds between background checks of the source export and change log for new data;
+# 0 checks only on file-change events (needs watchdog) and saved edits
+REFRESH_SECONDS = float(os.environ.get('DASHBOARD_REFRESH_SECONDS', 30))
+
+# Also build the default figures of each new dataset version before it is served
+WARMUP = os.environ.get('DASHBOARD_WARMUP', '1').lower() not in ('0', 'false', 'no')
+
+# Collect per-rerun timings, cache and payload stats and show them in a sidebar panel
+PROFILE = os.environ.get('DASHBOARD_PROFILE', '0').lower() not in ('0', 'false', 'no', '')
+
+# JSON-lines file each rerun profile is appended to; set to an empty string to disable
+PROFILE_LOG = os.environ.get('DASHBOARD_PROFILE_LOG', str(CACHE_DIR / 'profile.jsonl'))
+PROFILE_LOG = Path(PROFILE_LOG) if PROFILE_LOG else None
@@ -0,0 +1,98 @@
+"""Contingency tables between pairs of survey questions.
+
+Tables are aggregated from the count cube's answer codes with ``np.bincount``,
+so their cost depends on the number of distinct answer combinations rather
+than on the number of responses, and charts built from them carry one value
+per cell instead of the raw rows.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dashboard import schema
+
+
+@dataclass
+class Crosstab:
+    row: str
+    column: str
+    row_labels: list
+    column_labels: list
+    # int64 array of shape (len(row_labels), len(column_labels))
+    counts: np.ndarray
+    # Sum and number of focus ratings per cell, for the mean focus
+    focus_sum: np.ndarray
+    focus_n: np.ndarray
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=pd.Index(self.row_labels, name=self.row),
+                            columns=pd.Index(self.column_labels, name=self.column))
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def table(self):
+        """Response counts per (row answer, column answer)."""
+        return self._frame(self.counts)
+
+    def row_percent(self):
+        """Counts as a percentage of each row's total."""
+        totals = self.counts.sum(axis=1, keepdims=True)
+        return self._frame(np.divide(100.0 * self.counts, totals, out=np.zeros(self.counts.shape), where=totals > 0))
+
+    def column_percent(self):
+        """Counts as a percentage of each column's total."""
+        totals = self.counts.sum(axis=0, keepdims=True)
+        return self._frame(np.divide(100.0 * self.counts, totals, out=np.zeros(self.counts.shape), where=totals > 0))
+
+    def mean_focus(self):
+        """Mean focus rating per cell; NaN where no response in the cell rated focus."""
+        return self._frame(np.divide(self.focus_sum, self.focus_n, out=np.full(self.counts.shape, np.nan),
+                                     where=self.focus_n > 0))
+
+    def chi_square(self):
+        """Pearson's chi-square statistic and degrees of freedom, ignoring empty rows and columns."""
+        counts = self.counts[self.counts.sum(axis=1) > 0][:, self.counts.sum(axis=0) > 0].astype(float)
+        n = counts.sum()
+        if not n or min(counts.shape) < 2:
+            return 0.0, 0
+        expected = np.outer(counts.sum(axis=1), counts.sum(axis=0)) / n
+        statistic = float(((counts - expected) ** 2 / expected).sum())
+        return statistic, (counts.shape[0] - 1) * (counts.shape[1] - 1)
+
+    def cramers_v(self):
+        """Cramér's V association between the two questions, from 0 (none) to 1."""
+        statistic, dof = self.chi_square()
+        if not dof:
+            return float('nan')
+        counts = self.counts[self.counts.sum(axis=1) > 0][:, self.counts.sum(axis=0) > 0]
+        return float(np.sqrt(statistic / (counts.sum() * (min(counts.shape) - 1))))
+
+
+def crosstab(cube, row, column, filters=None):
+    """Cross-tabulate two cube columns, leaving out missing answers."""
+    r, c = cube.columns.index(row), cube.columns.index(column)
+    n_rows, n_cols = len(cube.labels[r]), len(cube.labels[c])
+    mask = cube.mask(filters)
+    mask &= (cube.codes[:, r] < n_rows) & (cube.codes[:, c] < n_cols)
+    cell = cube.codes[mask, r].astype(np.int64) * n_cols + cube.codes[mask, c]
+    counts = cube.counts[mask]
+    size = n_rows * n_cols
+
+    focus_sum = np.zeros(size)
+    focus_n = np.zeros(size)
+    if schema.FOCUS in cube.columns:
+        f = cube.columns.index(schema.FOCUS)
+        focus_values = np.append(np.asarray(cube.labels[f], dtype=float), np.nan)[cube.codes[mask, f]]
+        rated = ~np.isnan(focus_values)
+        focus_sum = np.bincount(cell[rated], weights=counts[rated] * focus_values[rated], minlength=size)
+        focus_n = np.bincount(cell[rated], weights=counts[rated], minlength=size)
+
+    return Crosstab(
+        row, column, list(cube.labels[r]), list(cube.labels[c]),
+        np.bincount(cell, weights=counts, minlength=size).astype(np.int64).reshape(n_rows, n_cols),
+        focus_sum.reshape(n_rows, n_cols), focus_n.reshape(n_rows, n_cols),
+    )
@@ -0,0 +1,114 @@
+"""Precomputed count cube over the categorical survey answers.
+
+Every distinct combination of answer codes is stored once with the number of
+respondents giving it, so marginal and filtered distributions are sums over
+cube cells rather than scans over the responses.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dashboard import schema
+
+# Filter option selecting the responses that left a question blank
+NO_ANSWER = "(no answer)"
+
+CUBE_COLUMNS = [
+    schema.AGE,
+    schema.SCREEN_TIME,
+    schema.DEVICE,
+    schema.STUDY_HOURS,
+    schema.SLEEP,
+    schema.BREAKS,
+    schema.NOTES,
+    schema.LOCATION,
+    schema.APP,
+    schema.FOCUS,
+]
+
+
+def encode_column(series):
+    """Return (codes, labels) for a column; missing answers get code -1."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories.tolist()
+    categorical = pd.Categorical(series)
+    return categorical.codes, categorical.categories.tolist()
+
+
+@dataclass
+class CountCube:
+    columns: list
+    labels: list
+    # One row per non-empty cell; missing answers use code len(labels[d])
+    codes: np.ndarray
+    counts: np.ndarray
+
+    def _dim(self, column):
+        return self.columns.index(column)
+
+    def mask(self, filters=None):
+        """Boolean mask over the cube cells matching ``filters``."""
+        mask = np.ones(len(self.counts), dtype=bool)
+        for column, selected in (filters or {}).items():
+            d = self._dim(column)
+            selected = set(selected)
+            wanted = [i for i, label in enumerate(self.labels[d]) if label in selected]
+            if NO_ANSWER in selected:
+                wanted.append(len(self.labels[d]))
+            mask &= np.isin(self.codes[:, d], wanted)
+        return mask
+
+    def options(self, column):
+        """Filter options of ``column``: its answer labels in category order, then
+        ``NO_ANSWER`` if some responses left it blank."""
+        d = self._dim(column)
+        missing = np.any(self.codes[:, d] == len(self.labels[d]))
+        return list(self.labels[d]) + ([NO_ANSWER] if missing else [])
+
+    def distribution(self, column, filters=None):
+        """Counts per label of ``column`` in label order, including zero counts."""
+        d = self._dim(column)
+        mask = self.mask(filters)
+        n_labels = len(self.labels[d])
+        counts = np.bincount(self.codes[mask, d], weights=self.counts[mask], minlength=n_labels + 1)
+        return pd.Series(counts[:n_labels].astype(np.int64),
+                         index=pd.Index(self.labels[d], name=column), name='count')
+
+    def value_counts(self, column, filters=None, sort=True):
+        """Like ``Series.value_counts`` on the filtered responses."""
+        counts = self.distribution(column, filters)
+        counts = counts[counts > 0]
+        return counts.sort_values(ascending=False, kind='stable') if sort else counts
+
+
+def build_cube(df, columns=None):
+    """Aggregate ``df`` into a ``CountCube`` over ``columns`` (default ``CUBE_COLUMNS``)."""
+    columns = [col for col in (columns or CUBE_COLUMNS) if col in df.columns]
+    labels = []
+    codes = np.empty((len(df), len(columns)), dtype=np.int64)
+    for d, col in enumerate(columns):
+        col_codes, col_labels = encode_column(df[col])
+        codes[:, d] = np.where(col_codes < 0, len(col_labels), col_codes)
+        labels.append(col_labels)
+
+    # Mixed-radix key per response, one radix slot per label plus one for missing
+    radices = [len(col_labels) + 1 for col_labels in labels]
+    code_dtype = np.min_scalar_type(max(radices, default=1))
+    if math.prod(radices) > np.iinfo(np.int64).max:
+        # Too many label combinations for one int64 key: group the code rows directly
+        cell_codes, counts = np.unique(codes, axis=0, return_counts=True)
+        return CountCube(columns, labels, cell_codes.astype(code_dtype), counts.astype(np.int64))
+
+    key = np.zeros(len(df), dtype=np.int64)
+    for d in range(len(columns)):
+        key = key * radices[d] + codes[:, d]
+    cells, counts = np.unique(key, return_counts=True)
+
+    cell_codes = np.empty((len(cells), len(columns)), dtype=code_dtype)
+    for d in reversed(range(len(columns))):
+        cell_codes[:, d] = cells % radices[d]
+        cells = cells // radices[d]
+    return CountCube(columns, labels, cell_codes, counts.astype(np.int64))
@@ -0,0 +1,67 @@
+"""Encoded feature matrix behind the 3D Visualizations page.
+
+The answer columns used as 3D axes are encoded once per dataset version into a
+compact float32 matrix (category codes and the focus rating) plus the label
+table for each categorical axis, taken from the column's category order.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from dashboard import schema
+from dashboard.cube import encode_column
+
+# Feature name -> source column; features other than focus are category codes
+FEATURES = {
+    'age_code': schema.AGE,
+    'screen_code': schema.SCREEN_TIME,
+    'focus_level': schema.FOCUS,
+    'study_hours_code': schema.STUDY_HOURS,
+}
+
+
+@dataclass
+class EncodedFeatures:
+    names: list
+    # float32 array of shape (n_rows, len(names)); missing answers are NaN
+    matrix: np.ndarray
+    # feature -> ordered tick labels, None for numeric features
+    labels: dict
+    # Hover text column; the dataset's own (memory-mapped) column, not a copy
+    text: pd.Series
+
+    @property
+    def n_rows(self):
+        return len(self.matrix)
+
+    def column(self, name):
+        return self.matrix[:, self.names.index(name)]
+
+    def axis(self, name):
+        """Plotly scene-axis settings placing ``name``'s labels on its codes."""
+        labels = self.labels.get(name)
+        if labels is None:
+            return {}
+        return dict(tickvals=list(range(len(labels))), ticktext=[str(label) for label in labels])
+
+
+def encode_features(df, features=None, text_column=None):
+    """Build ``EncodedFeatures`` for ``features`` (default ``FEATURES``)."""
+    features = features or FEATURES
+    names, labels = [], {}
+    matrix = np.full((len(df), len(features)), np.nan, dtype=np.float32)
+    for i, (name, col) in enumerate(features.items()):
+        names.append(name)
+        if col == schema.FOCUS:
+            matrix[:, i] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float32, na_value=np.nan)  # type: ignore
+            labels[name] = None
+        else:
+            codes, col_labels = encode_column(df[col])
+            matrix[:, i] = np.where(codes < 0, np.nan, codes)
+            labels[name] = col_labels
+
+    # Use first column as name if NAME column doesn't exist
+    text_column = text_column or ('NAME' if 'NAME' in df.columns else df.columns[0])
+    return EncodedFeatures(names, matrix, labels, df[text_column])
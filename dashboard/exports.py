@@ -0,0 +1,125 @@
+"""CSV, Excel and Parquet exports written lazily in row chunks.
+
+Exports are only produced when a download is requested (pass
+``lambda: export_file(...)`` as ``st.download_button(data=...)``). Each one is
+written chunk by chunk to a file under the cache directory, named after its
+key (dataset version plus filter or edit state), so repeated downloads of the
+same selection reuse the file and building one holds about one chunk in
+memory. Streamlit keeps the finished file's bytes in memory to serve the
+download either way.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+from dashboard import config
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+}
+
+
+def excel_available():
+    return importlib.util.find_spec('openpyxl') is not None
+
+
+def export_key(*parts):
+    """Stable short hash of JSON-serializable key parts (version, filters, edits)."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:20]
+
+
+def _chunks(df, rows=None, chunk_rows=None):
+    chunk_rows = chunk_rows or config.EXPORT_CHUNK_ROWS
+    n = len(df) if rows is None else len(rows)
+    for start in range(0, n, chunk_rows):
+        if rows is None:
+            yield df.iloc[start:start + chunk_rows]
+        else:
+            yield df.take(rows[start:start + chunk_rows])
+    if n == 0:
+        yield df.iloc[0:0]
+
+
+def _write_csv(chunks, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=i == 0)
+
+
+def _write_excel(chunks, path):
+    from openpyxl import Workbook  # type: ignore
+
+    # Write-only workbooks stream rows to disk instead of holding every cell
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sheet1')
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            sheet.append([str(col) for col in chunk.columns])
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(list(row))
+    workbook.save(path)
+
+
+def _write_parquet(chunks, path):
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+_WRITERS = {'csv': _write_csv, 'xlsx': _write_excel, 'parquet': _write_parquet}
+
+
+def prune_exports(export_dir, keep):
+    """Delete all but the ``keep`` most recently used export files."""
+    files = []
+    for path in export_dir.glob('*.*'):
+        # Other writers' in-progress *.tmp files are not exports yet
+        if path.suffix == '.tmp':
+            continue
+        try:
+            files.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    files.sort(reverse=True)
+    for _, path in files[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def export_file(df, fmt, key, rows=None):
+    """Contents (built on first use) of the ``fmt`` export of ``df`` for ``key``.
+
+    ``rows`` optionally restricts the export to these row positions. Returns the
+    file's bytes.
+    """
+    export_dir = Path(config.CACHE_DIR) / 'exports'
+    path = export_dir / f'{key}{EXPORT_FORMATS[fmt][1]}'
+    if path.exists():
+        os.utime(path)
+        return path.read_bytes()
+    export_dir.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f'.{os.getpid()}.tmp')
+    try:
+        _WRITERS[fmt](_chunks(df, rows), tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    data = path.read_bytes()
+    prune_exports(export_dir, config.EXPORT_CACHE_FILES)
+    return data
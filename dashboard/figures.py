@@ -0,0 +1,66 @@
+"""Process-wide LRU cache of built Plotly figures.
+
+Building a figure with plotly.express costs far more than Streamlit's own
+serialization of it, so figures are memoized by (dataset version, chart id,
+filter state) and evicted least-recently-used once their JSON size exceeds a
+byte budget. Cached figures are shared between sessions and must be treated as
+read-only.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+def freeze(state):
+    """Turn filter/widget state (dicts, lists, scalars) into a hashable cache key part."""
+    if isinstance(state, dict):
+        return tuple(sorted((str(k), freeze(v)) for k, v in state.items()))
+    if isinstance(state, (list, tuple, set, frozenset)):
+        items = [freeze(v) for v in state]
+        return tuple(sorted(items, key=repr)) if isinstance(state, (set, frozenset)) else tuple(items)
+    return state
+
+
+class FigureCache:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the cached figure for ``key``, calling ``build()`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        fig = build()
+        size = len(fig.to_json())
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (fig, size)
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted
+        return fig
+
+    def nbytes(self, key):
+        """Serialized size of the cached figure for ``key``, ``None`` if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
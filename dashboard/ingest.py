@@ -0,0 +1,485 @@
+"""Load the survey responses into a typed, columnar DataFrame.
+
+The source is either one CSV export (which may grow by appended responses) or
+a directory of CSV exports. Parsed responses are kept as typed Parquet parts
+under the cache directory, described by a JSON manifest recording, per source
+file, how many bytes have been parsed. A refresh parses only new files and
+the bytes appended to known ones, writes them as a new part and appends them
+to the frame already in memory; anything else (a file rewritten, truncated or
+removed) triggers a full rebuild. Processes sharing the cache directory take
+turns through a lock file in the store.
+
+Dataset versions look like ``<lineage>/<rows>``. Row positions within a
+lineage are stable, so anything keyed on them (e.g. the editor change log)
+survives appended responses. The manifest records the byte ranges the rows
+were parsed from, in row order; a rebuild (wiped cache, format bump, rewritten
+file) keeps a known lineage whose ranges still hold the same bytes by parsing
+them first, so it only changes when previously parsed responses did.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from dashboard import config, schema
+
+# Bump when the dtype inference or cache layout changes so stale caches are rebuilt
+CACHE_FORMAT = 2
+
+# Compact the parts into one once a store has more than this many
+MAX_PARTS = 32
+
+# Bytes before the parsed offset compared to detect a rewritten file
+_TAIL_BYTES = 4096
+
+# A source untouched for this long counts as completely written, so a final
+# line without a newline is parsed instead of held back as possibly partial
+_QUIET_SECONDS = 2.0
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+_LOWER_BOUND_WORDS = ('less', 'under', 'below', 'fewer', '<')
+_UPPER_BOUND_WORDS = ('more', 'over', 'above', 'plus', '+', '>')
+
+# Store directory -> (version, frame) of the last load in this process
+_frames = {}
+# Serializes loads between this process's threads; ``_store_lock`` between processes
+_lock = threading.Lock()
+
+
+def list_sources(path=None):
+    """CSV files making up the dataset: the file itself or a directory's *.csv, by name."""
+    path = Path(path or config.DATA_PATH)
+    if path.is_dir():
+        return sorted(p for p in path.glob('*.csv') if p.is_file())
+    return [path]
+
+
+def source_fingerprint(path=None):
+    """Cheap (path, (name, mtime, size, held back)...) tuple used to key in-process caches.
+
+    The held-back flag turns off once a file whose last line has no newline stops
+    changing, so the caches are re-keyed when that line becomes parseable.
+    """
+    path = Path(path or config.DATA_PATH)
+    files = []
+    for source in list_sources(path):
+        stat = source.stat()
+        files.append((source.name, stat.st_mtime_ns, stat.st_size, _held_back(source, stat)))
+    return (str(path),) + tuple(files)
+
+
+def _held_back(source, stat):
+    """Whether ``source`` ends in a line without a newline that may still be being written."""
+    if not stat.st_size or time.time() - stat.st_mtime_ns / 1e9 >= _QUIET_SECONDS:
+        return False
+    with open(source, 'rb') as f:
+        f.seek(stat.st_size - 1)
+        return f.read(1) != b'\n'
+
+
+def lineage(version):
+    """Part of a dataset version that stays fixed while responses are only appended."""
+    return version.split('/')[0]
+
+
+def bucket_sort_key(label):
+    """Sort key placing answer buckets like "Less than 2", "2-4", "More than 6" in order."""
+    text = str(label).strip().lower()
+    numbers = [float(n) for n in _NUMBER.findall(text)]
+    if not numbers:
+        return (1, float('inf'), text)
+    value = numbers[0]
+    if any(word in text for word in _LOWER_BOUND_WORDS):
+        value -= 0.5
+    elif any(word in text for word in _UPPER_BOUND_WORDS):
+        value = max(numbers) + 0.5
+    return (0, value, text)
+
+
+def infer_dtypes(df):
+    """Convert answer columns to compact dtypes.
+
+    Bucketed answers become ordered categoricals, other multiple-choice answers
+    plain categoricals and the focus rating a nullable Int8.
+    """
+    df = df.copy()
+    df.columns = [col.strip() for col in df.columns]
+
+    for col in df.columns:
+        if col == schema.FOCUS:
+            df[col] = pd.to_numeric(df[col], errors='coerce').round().astype('Int8')  # type: ignore
+        elif col in schema.ORDERED_COLUMNS:
+            categories = sorted(df[col].dropna().unique(), key=bucket_sort_key)
+            df[col] = pd.Categorical(df[col], categories=categories, ordered=True)
+        elif col in schema.UNORDERED_COLUMNS:
+            df[col] = df[col].astype('category')
+        elif pd.api.types.is_string_dtype(df[col]) and len(df) and \
+                df[col].nunique() <= len(df) * schema.CATEGORY_MAX_UNIQUE_RATIO:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def concat_typed(frames):
+    """Concatenate typed frames, merging categoricals instead of falling back to object.
+
+    Ordered answer columns keep their categories sorted by ``bucket_sort_key``.
+    Whether a column is categorical follows the first frame.
+    """
+    frames = [f for f in frames if len(f.columns)]
+    if len(frames) <= 1:
+        return frames[0].reset_index(drop=True) if frames else pd.DataFrame()
+
+    frames = [f.copy() for f in frames]
+    for col in frames[0].columns:
+        if not isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            for f in frames[1:]:
+                if col in f.columns and isinstance(f[col].dtype, pd.CategoricalDtype):
+                    f[col] = f[col].astype(f[col].cat.categories.dtype)
+            continue
+        for f in frames:
+            if col in f.columns and not isinstance(f[col].dtype, pd.CategoricalDtype):
+                f[col] = f[col].astype('category')
+        categories = list(dict.fromkeys(
+            c for f in frames if col in f.columns for c in f[col].cat.categories
+        ))
+        ordered = col in schema.ORDERED_COLUMNS
+        if ordered:
+            categories.sort(key=bucket_sort_key)
+        for f in frames:
+            if col in f.columns:
+                f[col] = f[col].cat.set_categories(categories, ordered=ordered)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _tail(path, offset):
+    with open(path, 'rb') as f:
+        f.seek(max(0, offset - _TAIL_BYTES))
+        return _sha(f.read(offset - max(0, offset - _TAIL_BYTES)))
+
+
+def _read_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def store_dir(path, cache_dir):
+    """Cache directory holding the manifest, Parquet parts and column store for ``path``."""
+    key = hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:12]
+    return Path(cache_dir) / key
+
+
+def _write_atomic(target, write):
+    tmp = target.with_name(target.name + f'.{os.getpid()}.tmp')
+    write(tmp)
+    os.replace(tmp, target)
+
+
+@contextmanager
+def _store_lock(store):
+    """Hold the store's lock file exclusively, so only one process at a time reads
+    and updates its manifest and parts (a rebuild deletes every part)."""
+    store.mkdir(parents=True, exist_ok=True)
+    with open(store / '.lock', 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after about 10 seconds; keep waiting
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_manifest(store):
+    try:
+        manifest = json.loads((store / 'manifest.json').read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format') != CACHE_FORMAT:
+        return None
+    if not all((store / part).exists() for part in manifest['parts']):
+        return None
+    return manifest
+
+
+def _file_entry(source, offset, stat=None):
+    stat = stat or source.stat()
+    # With a final line held back the file is not fully handled: record the parsed
+    # size so the next check (and ``cached_version``) reads the rest
+    size = stat.st_size if offset >= stat.st_size else offset
+    return {'offset': offset, 'size': size, 'mtime_ns': stat.st_mtime_ns,
+            'tail': _tail(source, offset)}
+
+
+def _write_part(store, manifest, df):
+    part = f'part-{len(manifest["parts"]):05d}-{uuid.uuid4().hex[:12]}.parquet'
+    _write_atomic(store / part, lambda tmp: df.to_parquet(tmp, index=False))
+    manifest['parts'].append(part)
+
+
+def _add_segment(segments, name, start, end):
+    # Byte range of a source the next rows were parsed from, merged into the last one if contiguous
+    if end <= start:
+        return
+    if segments and segments[-1][0] == name and segments[-1][2] == start:
+        segments[-1][2] = end
+    else:
+        segments.append([name, start, end])
+
+
+def _segments(manifest):
+    # Manifests written before segments were recorded parsed each file whole, in name order
+    if 'segments' not in manifest:
+        manifest['segments'] = [[name, 0, entry['offset']] for name, entry in sorted(manifest['files'].items())]
+    return manifest['segments']
+
+
+def _lineage_source(manifest):
+    return {'lineage': manifest['lineage'], 'raw_columns': manifest['raw_columns'],
+            'segments': _segments(manifest),
+            'files': {name: {'offset': entry['offset'], 'tail': entry['tail']}
+                      for name, entry in manifest['files'].items()}}
+
+
+def _extends(sources, known):
+    """Whether every source ``known`` parsed still holds the bytes it parsed."""
+    by_name = {source.name: source for source in sources}
+    for name, entry in known['files'].items():
+        source = by_name.get(name)
+        if source is None or source.stat().st_size < entry['offset'] or \
+                _tail(source, entry['offset']) != entry['tail']:
+            return False
+    return True
+
+
+def _save_manifest(store, manifest):
+    manifest['version'] = f'{manifest["lineage"]}/{manifest["n_rows"]}'
+    _write_atomic(store / 'manifest.json', lambda tmp: tmp.write_text(json.dumps(manifest)))
+
+
+def _previous_source(store):
+    # Lineage of the store's last manifest, whatever its format or state of its parts
+    try:
+        manifest = json.loads((store / 'manifest.json').read_text())
+        return _lineage_source(manifest)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _rebuild(store, sources, known_lineages=()):
+    """Parse every source from scratch into a fresh store.
+
+    If the sources still hold the bytes a lineage in ``known_lineages`` (or the
+    store's previous manifest) was parsed from, those ranges are parsed first, in
+    their recorded order, and the lineage is kept; the rest follows in name order.
+    """
+    previous = _previous_source(store)
+    store.mkdir(parents=True, exist_ok=True)
+    for old in store.glob('part-*.parquet'):
+        old.unlink(missing_ok=True)
+
+    candidates = [known for known in list(known_lineages) + [previous] if known and _extends(sources, known)]
+    base = max(candidates, key=lambda known: sum(end - start for _, start, end in known['segments']), default=None)
+    by_name = {source.name: source for source in sources}
+    raw_columns = base['raw_columns'] if base else None
+
+    def parse(source, start, end):
+        data = _read_range(source, start, end)
+        if start == 0:
+            return pd.read_csv(io.BytesIO(data)), data  # type: ignore
+        if not data.strip():
+            return None, data
+        return pd.read_csv(io.BytesIO(data), header=None, names=raw_columns), data  # type: ignore
+
+    frames, files, digests, segments = [], {}, [], []
+    covered = {}
+    for name, start, end in (base['segments'] if base else []):
+        frame, _ = parse(by_name[name], start, end)
+        if frame is not None:
+            frames.append(frame)
+        _add_segment(segments, name, start, end)
+        covered[name] = max(covered.get(name, 0), end)
+    for source in sources:
+        stat = source.stat()
+        start = covered.get(source.name, 0)
+        if stat.st_size > start:
+            frame, data = parse(source, start, stat.st_size)
+            if frame is not None:
+                frames.append(frame)
+            digests.append(source.name + ':' + _sha(data))
+            _add_segment(segments, source.name, start, stat.st_size)
+        files[source.name] = _file_entry(source, stat.st_size, stat)
+
+    df = concat_typed([infer_dtypes(f) for f in frames])
+    if base:
+        lineage_id = base['lineage']
+    else:
+        lineage_id = f'{CACHE_FORMAT}-{_sha(chr(10).join(digests).encode())[:16]}'
+        raw_columns = [str(c) for c in frames[0].columns] if frames else []
+    manifest = {'format': CACHE_FORMAT, 'lineage': lineage_id, 'n_rows': len(df),
+                'raw_columns': raw_columns, 'files': files, 'segments': segments, 'parts': []}
+    _write_part(store, manifest, df)
+    _save_manifest(store, manifest)
+    return df, manifest
+
+
+def _new_bytes(source, entry):
+    """Bytes appended to ``source`` since ``entry``, or ``None`` if the file was not
+    simply appended to. A final line without a newline is left out while the file
+    may still be being written (see ``_held_back``)."""
+    stat = source.stat()
+    if stat.st_size < entry['offset'] or _tail(source, entry['offset']) != entry['tail']:
+        return None, stat
+    data = _read_range(source, entry['offset'], stat.st_size)
+    if _held_back(source, stat):
+        data = data[:data.rfind(b'\n') + 1]
+    return data, stat
+
+
+def _load_parts(store, manifest):
+    return concat_typed([pd.read_parquet(store / part) for part in manifest['parts']])
+
+
+def cached_version(path=None, cache_dir=None):
+    """Version of the cached dataset if no source file changed since it was built, else ``None``.
+
+    Only stats the sources, so callers can open an existing copy of the dataset
+    without parsing or loading anything.
+    """
+    path = Path(path or config.DATA_PATH)
+    manifest = _read_manifest(store_dir(path, cache_dir or config.CACHE_DIR))
+    if manifest is None:
+        return None
+    files = {}
+    for source in list_sources(path):
+        stat = source.stat()
+        files[source.name] = (stat.st_size, stat.st_mtime_ns)
+    known = {name: (entry['size'], entry['mtime_ns']) for name, entry in manifest['files'].items()}
+    return manifest['version'] if files == known else None
+
+
+def lineage_source(path=None, cache_dir=None):
+    """How the cached dataset's rows were read: its lineage, raw columns, the source
+    byte ranges in row order and the parsed length and tail hash of each file.
+
+    Kept next to anything keyed on the lineage (see ``dashboard.changelog``) and
+    passed back to ``read_survey`` as ``known_lineages``, so a rebuilt cache
+    keeps the lineage while those bytes are unchanged.
+    """
+    path = Path(path or config.DATA_PATH)
+    manifest = _read_manifest(store_dir(path, cache_dir or config.CACHE_DIR))
+    return _lineage_source(manifest) if manifest else None
+
+
+def remember_frame(df, version, path=None, cache_dir=None):
+    """Use ``df`` as this process's in-memory copy of ``version`` for the next incremental load."""
+    path = Path(path or config.DATA_PATH)
+    with _lock:
+        _frames[store_dir(path, cache_dir or config.CACHE_DIR)] = (version, df)
+
+
+def read_survey(path=None, cache_dir=None, known_lineages=()):
+    """Return the typed survey DataFrame and its dataset version string.
+
+    The version changes whenever responses change and is meant to key any
+    downstream cache; see ``lineage`` for the part that survives appends.
+    ``known_lineages`` are ``lineage_source`` results a rebuild may keep.
+    """
+    path = Path(path or config.DATA_PATH)
+    store = store_dir(path, cache_dir or config.CACHE_DIR)
+    sources = list_sources(path)
+
+    with _lock, _store_lock(store):
+        manifest = _read_manifest(store)
+        cached = _frames.get(store)
+
+        if manifest is None or set(manifest['files']) - {s.name for s in sources}:
+            df, manifest = _rebuild(store, sources, known_lineages)
+            _frames[store] = (manifest['version'], df)
+            return df, manifest['version']
+
+        chunks, files = [], dict(manifest['files'])
+        for source in sources:
+            entry = files.get(source.name)
+            stat = source.stat()
+            if entry is not None and (entry['size'], entry['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            start = 0 if entry is None else entry['offset']
+            if entry is None:
+                data = _read_range(source, 0, stat.st_size)
+                chunk = pd.read_csv(io.BytesIO(data))  # type: ignore
+                if [str(c) for c in chunk.columns] != manifest['raw_columns']:
+                    chunk = None
+                offset = stat.st_size
+            else:
+                data, stat = _new_bytes(source, entry)
+                if data is None:
+                    chunk = None
+                else:
+                    chunk = pd.read_csv(io.BytesIO(data), header=None, names=manifest['raw_columns']) \
+                        if data.strip() else pd.DataFrame(columns=manifest['raw_columns'])  # type: ignore
+                offset = entry['offset'] + len(data or b'')
+            if chunk is None:
+                # Columns changed or the file was rewritten: start over
+                df, manifest = _rebuild(store, sources, known_lineages)
+                _frames[store] = (manifest['version'], df)
+                return df, manifest['version']
+            chunks.append(chunk)
+            files[source.name] = _file_entry(source, offset, stat)
+            _add_segment(_segments(manifest), source.name, start, offset)
+
+        if cached is not None and cached[0] == manifest['version']:
+            df = cached[1]
+        else:
+            df = _load_parts(store, manifest)
+
+        new_rows = [chunk for chunk in chunks if len(chunk)]
+        if new_rows:
+            added = infer_dtypes(pd.concat(new_rows, ignore_index=True))
+            df = concat_typed([df, added])
+            _write_part(store, manifest, added)
+            manifest['n_rows'] = len(df)
+        manifest['files'] = files
+        if len(manifest['parts']) > MAX_PARTS:
+            stale = manifest['parts']
+            manifest['parts'] = []
+            _write_part(store, manifest, df)
+            _save_manifest(store, manifest)
+            for part in stale:
+                (store / part).unlink(missing_ok=True)
+        elif chunks:
+            _save_manifest(store, manifest)
+
+        _frames[store] = (manifest['version'], df)
+        return df, manifest['version']
@@ -0,0 +1,50 @@
+"""Server-side sorting and paging for the table views.
+
+Tables only ever receive one page of rows. Row selections are arrays of row
+positions (e.g. from the bitmap index), sort orders are position permutations
+computed once per (dataset version, column, direction), and a page is a slice
+of the sorted selection.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def sort_order(series, ascending=True):
+    """Row positions of ``series`` in sorted order, missing values last."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.int64)
+        # Missing values (code -1) sort after every category in both directions
+        keys = np.where(codes < 0, len(series.cat.categories), codes if ascending else -codes)
+        return np.argsort(keys, kind='stable')
+    positions = series.reset_index(drop=True).sort_values(
+        ascending=ascending, kind='stable', na_position='last'
+    ).index
+    return np.asarray(positions)
+
+
+def page_bounds(n_rows, page_size, page):
+    """Return (start, stop, n_pages) for 1-based ``page``, clamped to the last page."""
+    n_pages = max(1, math.ceil(n_rows / page_size))
+    page = min(max(1, page), n_pages)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, n_rows), n_pages
+
+
+def window(n_rows, rows=None, order=None, start=0, stop=None):
+    """Row positions shown on a page.
+
+    ``rows`` restricts the table to a selection (ascending positions), ``order``
+    is a full sort permutation; either may be ``None``.
+    """
+    if order is None:
+        selected = np.arange(n_rows) if rows is None else np.asarray(rows)
+    elif rows is None:
+        selected = order
+    else:
+        keep = np.zeros(n_rows, dtype=bool)
+        keep[rows] = True
+        selected = order[keep[order]]
+    return selected[start:stop]
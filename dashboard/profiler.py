@@ -0,0 +1,147 @@
+"""Per-rerun profiling of the dashboard script.
+
+Disabled unless ``config.PROFILE`` is set. A profile is started at the top of
+each rerun and collects section timings, call and miss counts of the
+Streamlit caches, payload sizes of the charts and tables sent to the browser
+and the peak traced memory. ``finish`` appends it as one JSON line to
+``config.PROFILE_LOG`` so hot spots can be found from production logs.
+
+Peak memory comes from ``tracemalloc``, which is process-wide: with several
+sessions rerunning at once their allocations overlap. Tracing also slows
+allocation-heavy code down, one reason profiling is opt-in.
+"""
+
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+from dashboard import config
+
+_state = threading.local()
+_log_lock = threading.Lock()
+
+
+@dataclass
+class RerunProfile:
+    started_at: float
+    page: str = None
+    total_seconds: float = None
+    peak_bytes: int = None
+    # [name, depth, seconds] in the order sections were entered
+    sections: list = field(default_factory=list)
+    # cache name -> {'calls', 'misses'} plus 'seconds' for the Streamlit caches
+    caches: dict = field(default_factory=dict)
+    # [kind, name, bytes]
+    payloads: list = field(default_factory=list)
+
+
+def current():
+    """Profile of the rerun running on this thread, or ``None`` when not profiling."""
+    return getattr(_state, 'profile', None)
+
+
+def start():
+    """Begin profiling a rerun; a no-op unless profiling is enabled."""
+    if not config.PROFILE:
+        _state.profile = None
+        return None
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    _state.profile = RerunProfile(time.time())
+    _state.baseline = tracemalloc.get_traced_memory()[0]
+    _state.clock = time.perf_counter()
+    _state.depth = 0
+    return _state.profile
+
+
+def finish(page=None):
+    """Close the current rerun's profile, append it to the log and return it."""
+    profile = current()
+    if profile is None:
+        return None
+    _state.profile = None
+    profile.page = page
+    profile.total_seconds = time.perf_counter() - _state.clock
+    profile.peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - _state.baseline)
+    if config.PROFILE_LOG:
+        config.PROFILE_LOG.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(asdict(profile), default=str)
+        with _log_lock, open(config.PROFILE_LOG, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+    return profile
+
+
+@contextmanager
+def section(name):
+    """Time the enclosed block as ``name``, nested under any enclosing section."""
+    profile = current()
+    if profile is None:
+        yield
+        return
+    entry = [name, _state.depth, None]
+    profile.sections.append(entry)
+    _state.depth += 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry[2] = time.perf_counter() - started
+        _state.depth -= 1
+
+
+def payload(kind, name, nbytes):
+    """Record the size of a chart or table sent to the browser.
+
+    ``nbytes`` may be a callable, only evaluated when profiling.
+    """
+    profile = current()
+    if profile is not None:
+        profile.payloads.append([kind, name, int(nbytes() if callable(nbytes) else nbytes)])
+
+
+def arrow_nbytes(frame):
+    """Size of ``frame`` as the Arrow table Streamlit sends for ``st.dataframe``."""
+    import pyarrow as pa  # type: ignore
+
+    return pa.Table.from_pandas(frame).nbytes
+
+
+def count(name, key, amount=1):
+    """Add ``amount`` to the ``key`` ('calls', 'misses' or 'seconds') counter of cache ``name``."""
+    profile = current()
+    if profile is not None:
+        stats = profile.caches.setdefault(name, {'calls': 0, 'misses': 0})
+        stats[key] = stats.get(key, 0) + amount
+
+
+def cached(name, decorator):
+    """Apply a Streamlit cache ``decorator`` and count calls and misses of the result.
+
+    A miss is a call that runs the function body. Use as
+    ``@profiler.cached('load_cube', st.cache_data)``.
+    """
+    def wrap(func):
+        @functools.wraps(func)
+        def body(*args, **kwargs):
+            count(name, 'misses')
+            return func(*args, **kwargs)
+
+        cached_body = decorator(body)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return cached_body(*args, **kwargs)
+            finally:
+                count(name, 'calls')
+                count(name, 'seconds', time.perf_counter() - started)
+
+        call.clear = cached_body.clear
+        return call
+    return wrap
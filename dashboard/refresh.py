@@ -0,0 +1,199 @@
+"""Stale-while-revalidate serving of the dataset.
+
+Pages get the dataset from ``current_data()``, which returns the snapshot
+the ``Refresher`` is serving without touching the source files. A daemon
+thread re-checks the source export and the change log every
+``config.REFRESH_SECONDS`` and, when watchdog is installed, as soon as a file
+in their directories changes. When the dataset changed it loads, encodes and
+aggregates the new version (and builds the default figures, see
+``dashboard.warmup``) while sessions keep getting the previous snapshot, then
+swaps the new one in with a single assignment. Only the very first rerun of a
+server process waits for the data to load.
+"""
+
+import importlib.util
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import streamlit as st
+
+from dashboard import changelog, config, warmup
+from dashboard.ingest import source_fingerprint
+
+# Quiet period after a file-change event before the source is read, so a burst
+# of writes (an export being copied in) is loaded once
+SETTLE_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    key: tuple
+    df: object
+    version: str
+    lineage: str
+    loaded_at: float
+
+
+def dataset_key():
+    """(source fingerprint, change-log head): changes whenever the served dataset would."""
+    return source_fingerprint(), changelog.head()
+
+
+def watch_available():
+    return importlib.util.find_spec('watchdog') is not None
+
+
+class Refresher:
+    def __init__(self):
+        self.snapshot = None
+        self.status = warmup.WarmupStatus()
+        self.checked_at = None
+        # Serializes loads: the first one, the scheduler's and on-demand ones
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._warmed_key = None
+        self._observer = None
+
+    def current(self):
+        """The snapshot being served; loads the first one if there is none yet."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            with self._lock:
+                if self.snapshot is None:
+                    key = dataset_key()
+                    status = self.status = warmup.WarmupStatus(warmup.RUNNING, started_at=time.time())
+                    df, version, data_lineage = warmup.warm_data(*key, status)
+                    self._swap(key, df, version, data_lineage, status)
+                    self._start()
+            snapshot = self.snapshot
+        return snapshot
+
+    def refresh(self, figures=True):
+        """Load the dataset if it changed since the served snapshot and swap it in.
+
+        Blocks until done; returns True if a new snapshot is being served. Sessions
+        calling ``current()`` meanwhile keep getting the previous one. Only loading
+        the data holds the lock, so an on-demand refresh (a saved edit) never waits
+        for the figures of a version the scheduler is preparing.
+        """
+        with self._lock:
+            key = dataset_key()
+            self.checked_at = time.time()
+            served = self.snapshot
+            if served is not None and key == served.key:
+                return False
+            status = self.status = warmup.WarmupStatus(warmup.RUNNING, started_at=time.time())
+            try:
+                df, version, data_lineage = warmup.warm_data(*key, status)
+            except Exception as e:
+                self._fail(status, e)
+                raise
+            if not (figures and config.WARMUP):
+                self._swap(key, df, version, data_lineage, status)
+                return True
+
+        try:
+            warmup.warm_figures(df, version, status)
+        except Exception as e:
+            self._fail(status, e)
+            raise
+        self._warmed_key = key
+        with self._lock:
+            if self.snapshot is not served:
+                # An on-demand refresh swapped in the same or a newer version meanwhile
+                return False
+            self._swap(key, df, version, data_lineage, status)
+            return True
+
+    def _fail(self, status, error):
+        status.error = str(error)
+        status.state = warmup.FAILED
+        status.step = None
+        status.finished_at = time.time()
+
+    def wake(self):
+        """Ask the scheduler thread to check the source now."""
+        self._wake.set()
+
+    def _swap(self, key, df, version, data_lineage, status):
+        self.snapshot = Snapshot(key, df, version, data_lineage, time.time())
+        self.checked_at = self.snapshot.loaded_at
+        status.state = warmup.DONE
+        status.step = None
+        status.finished_at = time.time()
+
+    def _start(self):
+        threading.Thread(target=self._run, name='dashboard-refresh', daemon=True).start()
+        if watch_available():
+            self._watch()
+
+    def _run(self):
+        while True:
+            snapshot = self.snapshot
+            if config.WARMUP and self._warmed_key != snapshot.key:
+                # Figures of a snapshot loaded without them (first load, editor saves)
+                self._warm_figures(snapshot)
+            self._wake.wait(config.REFRESH_SECONDS or None)
+            self._wake.clear()
+            while self._wake.wait(SETTLE_SECONDS):
+                self._wake.clear()
+            try:
+                self.refresh()
+            except Exception:
+                # Recorded on the status; the previous snapshot stays in service
+                pass
+
+    def _warm_figures(self, snapshot):
+        status = self.status = warmup.WarmupStatus(warmup.RUNNING, version=snapshot.version, started_at=time.time())
+        try:
+            warmup.warm_figures(snapshot.df, snapshot.version, status)
+        except Exception as e:
+            self._fail(status, e)
+        else:
+            status.state = warmup.DONE
+            status.step = None
+            status.finished_at = time.time()
+        self._warmed_key = snapshot.key
+
+    def _watch(self):
+        # Wake the scheduler on any change next to the export(s) or the change log
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        refresher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ('created', 'modified', 'moved', 'deleted'):
+                    refresher.wake()
+
+        data_path = Path(config.DATA_PATH)
+        folders = {data_path if data_path.is_dir() else data_path.parent, changelog.changelog_path().parent}
+        observer = Observer()
+        observer.daemon = True
+        for folder in folders:
+            if folder.is_dir():
+                observer.schedule(Handler(), str(folder))
+        observer.start()
+        self._observer = observer
+
+
+@st.cache_resource
+def load_refresher():
+    return Refresher()
+
+
+def current_data():
+    """(df, version, lineage) of the dataset being served."""
+    snapshot = load_refresher().current()
+    return snapshot.df, snapshot.version, snapshot.lineage
+
+
+def refresh_now():
+    """Serve the current source and change log from the next rerun on, e.g. after saving edits."""
+    refresher = load_refresher()
+    refresher.refresh(figures=False)
+    # Figures of the new version are built by the scheduler thread
+    refresher.wake()
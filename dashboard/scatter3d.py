@@ -0,0 +1,96 @@
+"""Scatter3d traces that stay small as the number of responses grows.
+
+The 3D axes are answer codes, so most respondents share a point with others.
+The aggregated mode draws one marker per distinct (x, y, z) tuple, sized and
+coloured by how many responses fall on it. The individual mode keeps one
+marker per response but samples down to ``max_points`` above that size.
+"""
+
+import numpy as np
+import plotly.graph_objects as go  # type: ignore
+
+AGGREGATED = "Aggregated"
+INDIVIDUAL = "Individual"
+POINT_MODES = [AGGREGATED, INDIVIDUAL]
+
+_MIN_SIZE, _MAX_SIZE = 6, 30
+
+
+def aggregate_points(x, y, z):
+    """Return (points, counts): distinct (x, y, z) rows and their multiplicities."""
+    points = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float),
+                              np.asarray(z, dtype=float)])
+    points = points[~np.isnan(points).any(axis=1)]
+    if not len(points):
+        return points, np.zeros(0, dtype=np.int64)
+    return np.unique(points, axis=0, return_counts=True)
+
+
+def sample_rows(n_rows, max_points, seed=0):
+    """Sorted row positions of a reproducible sample of at most ``max_points`` rows."""
+    if n_rows <= max_points:
+        return np.arange(n_rows)
+    return np.sort(np.random.default_rng(seed).choice(n_rows, max_points, replace=False))
+
+
+def axis_labels(values, labels=None):
+    """Hover labels for axis ``values``: the answer behind each code, or the number itself."""
+    if labels is None:
+        return np.array([f'{value:g}' for value in values], dtype=object)
+    return np.array([str(labels[int(value)]) for value in values], dtype=object)
+
+
+def _take(values, rows):
+    return None if values is None else np.asarray(values)[rows]
+
+
+def scatter3d_trace(x, y, z, mode, colorscale, color=None, text=None,
+                    hovertemplate=None, max_points=5000, labels=(None, None, None)):
+    """Build a Scatter3d trace for ``mode`` (``AGGREGATED`` or ``INDIVIDUAL``).
+
+    ``color`` and ``text`` only apply to the individual mode; aggregated
+    markers are coloured by response count. ``text`` may be a pandas Series;
+    only the sampled rows are converted to strings. ``labels`` holds each
+    axis's answer labels (None for numeric axes), shown in the aggregated
+    markers' hover text.
+    """
+    if mode == AGGREGATED:
+        points, counts = aggregate_points(x, y, z)
+        scale = np.sqrt(counts / counts.max()) if len(counts) else counts
+        return go.Scatter3d(  # type: ignore
+            x=points[:, 0],
+            y=points[:, 1],
+            z=points[:, 2],
+            mode='markers',
+            marker=dict(
+                size=_MIN_SIZE + (_MAX_SIZE - _MIN_SIZE) * scale,
+                color=counts,
+                colorscale=colorscale,
+                showscale=True,
+                colorbar=dict(title="Responses"),
+                opacity=0.8
+            ),
+            customdata=np.column_stack([counts.astype(object)] + [
+                axis_labels(points[:, i], labels[i]) for i in range(3)
+            ]),
+            hovertemplate='<b>%{customdata[0]} responses</b><br>'
+                          '%{customdata[1]} / %{customdata[2]} / %{customdata[3]}<extra></extra>'
+        )
+
+    rows = sample_rows(len(x), max_points)
+    return go.Scatter3d(  # type: ignore
+        x=_take(x, rows),
+        y=_take(y, rows),
+        z=_take(z, rows),
+        mode='markers',
+        marker=dict(
+            size=8,
+            color=_take(color, rows),
+            colorscale=colorscale,
+            showscale=True,
+            colorbar=dict(title="Focus Level"),
+            opacity=0.8
+        ),
+        text=None if text is None else text.take(rows).astype(str).to_numpy(),
+        hovertemplate=hovertemplate
+    )
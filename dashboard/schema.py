@@ -0,0 +1,24 @@
+"""Column names and answer groupings of the survey export."""
+
+AGE = 'What is your age?'
+SCREEN_TIME = 'How many hours do you spend on screens each day?'
+DEVICE = 'What device do you use most for screen time?'
+STUDY_HOURS = 'About how many hours a day do you spend studying?'
+SLEEP = 'How many hours of sleep do you usually get on school nights?'
+BREAKS = 'How often do you take breaks while studying?'
+NOTES = 'How do you usually take notes when studying?'
+LOCATION = 'Where do you usually study?'
+APP = 'Which app do you use most for studying?'
+FOCUS = 'How focused do you feel when you study? (1 = not focused, 5 = very focused)'
+
+# Bucketed answers whose options have a natural order (e.g. "2-4 hours" < "4-6 hours")
+ORDERED_COLUMNS = [AGE, SCREEN_TIME, STUDY_HOURS, SLEEP]
+
+# Multiple-choice answers without a natural order
+UNORDERED_COLUMNS = [DEVICE, BREAKS, NOTES, LOCATION, APP]
+
+# Integer rating scale
+FOCUS_MIN, FOCUS_MAX = 1, 5
+
+# Free-text columns with at most this share of distinct values are stored as categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
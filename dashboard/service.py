@@ -0,0 +1,100 @@
+"""Cached data access shared by the dashboard pages.
+
+Every page gets the dataset's derived structures (count cube, bitmap index,
+encoded 3D features, crosstabs, KPI summaries, sort orders, built figures) from
+here, so they are built once per dataset version and shared by all sessions
+and pages; the dataset itself is loaded here and served by
+``dashboard.refresh``. Caches keyed by version keep two entries: the version
+being served and the one being prepared to replace it. Plotting libraries are
+not imported by this module; figures are built by the callables the pages
+pass to ``cached_figure``.
+"""
+
+import streamlit as st
+
+from dashboard import changelog, config, profiler
+from dashboard.bitmap import build_index
+from dashboard.colstore import open_dataset
+from dashboard.crosstab import crosstab
+from dashboard.cube import build_cube
+from dashboard.encoding import encode_features
+from dashboard.figures import FigureCache, freeze
+from dashboard.ingest import lineage, lineage_source
+from dashboard.paging import sort_order
+from dashboard.summary import column_types, summarize
+
+# Question-pair contingency table views offered by the Relationships tab -> Crosstab method
+CROSSTAB_MEASURES = {"Count": "table", "Row %": "row_percent", "Column %": "column_percent", "Mean focus": "mean_focus"}
+
+
+# cache_resource: every session shares the one memory-mapped frame instead of
+# unpickling a private copy per rerun; it is read-only and never mutated
+@profiler.cached('load_data', st.cache_resource(max_entries=2))
+def load_data(fingerprint, changes_head):
+    # The fingerprint (source files' mtimes and sizes) and change-log head only
+    # key the cache; the column store is shared by all server processes and is
+    # only rebuilt when dashboard.ingest has new responses to add; a rebuild keeps
+    # the lineage the saved changes were made against while its rows are unchanged
+    df, version = open_dataset(fingerprint[0], known_lineages=changelog.known_lineages())
+    # Saved Raw Data Editor changes are applied on top of the base snapshot
+    records = changelog.read_changes(lineage(version))
+    if not records:
+        return df, version, lineage(version)
+    changelog.save_lineage(lineage(version), lineage_source(fingerprint[0]))
+    return changelog.apply_changes(df, records), f'{version}+{changes_head}', lineage(version)
+
+
+# Count cube shared by the Analytics and Filtered Analysis pages
+@profiler.cached('load_cube', st.cache_data(max_entries=2))
+def load_cube(version, _df):
+    return build_cube(_df)
+
+
+# Question-pair contingency tables for the Relationships tab, aggregated from the cube
+@profiler.cached('load_crosstab', st.cache_resource(max_entries=64))
+def load_crosstab(version, row, column, _cube):
+    return crosstab(_cube, row, column)
+
+
+# Headline KPIs (totals, distinct answers, modes, mean focus) per row selection, aggregated from the cube
+@profiler.cached('load_summary', st.cache_resource(max_entries=64))
+def load_summary(version, filters, _cube, _df):
+    return summarize(_cube, column_types(_df), filters, version)
+
+
+# Bitmap index for the row filters; read-only, so shared without copying
+@profiler.cached('load_filter_index', st.cache_resource(max_entries=2))
+def load_filter_index(version, _df):
+    return build_index(_df)
+
+
+# Encoded 3D axis features; read-only, so shared without copying
+@profiler.cached('load_features', st.cache_resource(max_entries=2))
+def load_features(version, _df):
+    return encode_features(_df)
+
+
+# Sort permutations for the paged tables; read-only, so shared without copying
+@profiler.cached('load_sort_order', st.cache_resource(max_entries=32))
+def load_sort_order(version, column, ascending, _df):
+    return sort_order(_df[column], ascending)
+
+
+# Built figures shared by all sessions, keyed by dataset version, chart id and widget state
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache(config.FIGURE_CACHE_BYTES)
+
+
+def cached_figure(version, chart_id, build, state=None):
+    """The figure ``build()`` makes for ``chart_id`` at ``state``, built once per dataset version."""
+    def counted_build():
+        profiler.count('figures', 'misses')
+        return build()
+
+    key = (version, chart_id, freeze(state))
+    with profiler.section(f"figure {chart_id}"):
+        fig = load_figure_cache().get(key, counted_build)
+    profiler.count('figures', 'calls')
+    profiler.payload('plotly_chart', chart_id, lambda: load_figure_cache().nbytes(key) or len(fig.to_json()))
+    return fig
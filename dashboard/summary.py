@@ -0,0 +1,94 @@
+"""Headline KPIs of a row selection in one pass over the count cube.
+
+All answer columns of the cube are counted with a single ``np.bincount`` over
+the matching cells' codes (each column's codes offset into its own slot
+range), and the response total, answered counts, distinct answers, modes and
+mean focus are read off those counts. The cost depends on the number of cube
+cells rather than on the number of responses, so the numbers come back in
+about the same time for any filter state. Print the summary of the served
+dataset as JSON with::
+
+    python -m dashboard.summary
+"""
+
+import json
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from dashboard import schema
+
+
+@dataclass
+class Summary:
+    version: str
+    # {column: selected labels} the summary is restricted to, None for all responses
+    filters: dict
+    responses: int
+    # (column, dtype) of every dataset column
+    columns: list
+    # Per cube column: responses answering it, distinct answers given, most common answer
+    answered: dict
+    distinct: dict
+    modes: dict
+    focus_mean: float = None
+
+    def to_dict(self):
+        return asdict(self)
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, default=str)
+
+
+def column_types(df):
+    """(column, dtype name) of every column of ``df``; metadata only."""
+    return [(col, str(dtype)) for col, dtype in df.dtypes.items()]
+
+
+def summarize(cube, columns, filters=None, version=None):
+    """``Summary`` of the responses in ``cube`` matching ``filters`` ({column: selected labels})."""
+    codes, counts = cube.codes, cube.counts
+    if filters:
+        mask = cube.mask(filters)
+        codes, counts = codes[mask], counts[mask]
+
+    # Slot range per column: one slot per label plus one for missing answers
+    sizes = np.array([len(labels) + 1 for labels in cube.labels], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    totals = np.bincount((codes + offsets).ravel(), weights=np.repeat(counts, len(sizes)),
+                         minlength=int(sizes.sum())).astype(np.int64)
+
+    answered, distinct, modes = {}, {}, {}
+    focus_mean = None
+    for d, column in enumerate(cube.columns):
+        column_counts = totals[offsets[d]:offsets[d] + sizes[d] - 1]
+        n = int(column_counts.sum())
+        answered[column] = n
+        distinct[column] = int(np.count_nonzero(column_counts))
+        # Ties resolve to the first label in category order
+        modes[column] = cube.labels[d][int(np.argmax(column_counts))] if n else None
+        if column == schema.FOCUS and n:
+            focus_mean = float(np.dot(np.asarray(cube.labels[d], dtype=float), column_counts) / n)
+
+    return Summary(
+        version=version,
+        filters={column: list(selected) for column, selected in filters.items()} if filters else None,
+        responses=int(counts.sum()),
+        columns=columns,
+        answered=answered,
+        distinct=distinct,
+        modes=modes,
+        focus_mean=focus_mean,
+    )
+
+
+def main():
+    from dashboard import service
+    from dashboard.refresh import dataset_key
+
+    df, version, _ = service.load_data(*dataset_key())
+    print(service.load_summary(version, None, service.load_cube(version, df), df).to_json())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Synthetic survey responses shaped like the Google Form export.
+
+Used to benchmark the dashboard at sizes the real export never reaches and to
+run it without access to the real responses::
+
+    python -m dashboard.synthetic responses.csv --rows 1000000
+
+Answers are drawn from the form's options with a mild dependence of focus on
+screen time, study hours and sleep, so relationship charts are not flat, and a
+small share of optional answers is left blank.
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from dashboard import schema
+
+# Options offered by the form, in the order of the export's columns
+ANSWERS = {
+    schema.AGE: ['Under 15', '15-17', '18-20', '21+'],
+    schema.SCREEN_TIME: ['Less than 2 hours', '2-4 hours', '4-6 hours', 'More than 6 hours'],
+    schema.DEVICE: ['Phone', 'Laptop', 'Tablet', 'TV'],
+    schema.STUDY_HOURS: ['Less than 1 hour', '1-2 hours', '2-3 hours', 'More than 3 hours'],
+    schema.SLEEP: ['Less than 6 hours', '6-7 hours', '7-8 hours', 'More than 8 hours'],
+    schema.BREAKS: ['Rarely', 'Sometimes', 'Often'],
+    schema.NOTES: ['Paper', 'Digital', 'Both'],
+    schema.LOCATION: ['Home', 'Library', 'School'],
+    schema.APP: ['YouTube', 'Notion', 'Google Docs', 'Quizlet', 'Other'],
+}
+
+# Relative frequency of each option, aligned with ANSWERS
+WEIGHTS = {
+    schema.AGE: [0.15, 0.45, 0.3, 0.1],
+    schema.SCREEN_TIME: [0.1, 0.3, 0.35, 0.25],
+    schema.DEVICE: [0.55, 0.3, 0.1, 0.05],
+    schema.STUDY_HOURS: [0.2, 0.4, 0.25, 0.15],
+    schema.SLEEP: [0.2, 0.35, 0.3, 0.15],
+}
+
+CHUNK_ROWS = 500_000
+
+
+def generate_responses(n_rows, seed=0, start=0, missing_rate=0.01):
+    """Return ``n_rows`` raw responses as exported by the form (untyped, CSV headers).
+
+    ``start`` numbers the responses (timestamps, names) so chunks generated with
+    increasing ``start`` continue each other.
+    """
+    rng = np.random.default_rng([seed, start])
+    codes = {}
+    for col, options in ANSWERS.items():
+        codes[col] = rng.choice(len(options), size=n_rows, p=_probabilities(col))
+
+    # Focus drops with screen time and rises with study hours and sleep
+    focus = 3.2 - 0.45 * (codes[schema.SCREEN_TIME] - 1.5) + 0.3 * (codes[schema.STUDY_HOURS] - 1.5) \
+        + 0.25 * (codes[schema.SLEEP] - 1.5) + rng.normal(0, 0.9, n_rows)
+    focus = np.clip(np.rint(focus), schema.FOCUS_MIN, schema.FOCUS_MAX)
+
+    index = np.arange(start, start + n_rows)
+    timestamps = np.datetime64('2025-01-06T08:00:00') + index * np.timedelta64(37, 's')
+    data = {
+        'Timestamp': np.char.replace(np.datetime_as_string(timestamps), 'T', ' '),
+        'NAME': np.char.add('Student ', index.astype(str)),
+    }
+    for col, options in ANSWERS.items():
+        answers = np.asarray(options, dtype=object)[codes[col]]
+        answers[rng.random(n_rows) < missing_rate] = None
+        data[col] = answers
+    data[schema.FOCUS] = pd.array(focus, dtype='Int8')
+    data[schema.FOCUS][rng.random(n_rows) < missing_rate] = pd.NA
+
+    df = pd.DataFrame(data)
+    # The export's age header carries a trailing space
+    return df.rename(columns={schema.AGE: schema.AGE + ' '})
+
+
+def _probabilities(col):
+    weights = np.asarray(WEIGHTS.get(col, [1.0] * len(ANSWERS[col])), dtype=float)
+    return weights / weights.sum()
+
+
+def write_csv(path, n_rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Write ``n_rows`` synthetic responses to ``path`` in chunks of ``chunk_rows``."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for start in range(0, max(n_rows, 1), chunk_rows):
+            chunk = generate_responses(min(chunk_rows, n_rows - start), seed, start)
+            chunk.to_csv(f, index=False, header=start == 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write synthetic survey responses to a CSV file.')
+    parser.add_argument('path')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    write_csv(args.path, args.rows, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Cache warm-up steps run off the request path by ``dashboard.refresh``.
+
+``warm_data`` loads a dataset state through ``dashboard.service`` and builds
+its aggregates; ``warm_figures`` builds every figure the pages show with
+their default widget state, under the same chart ids and state the pages
+use, so first visits hit the figure cache. Both report progress on a
+``WarmupStatus``. The on-disk column store the data is loaded from is shared
+between processes and can be built ahead of a deploy with::
+
+    python -m dashboard.warmup
+"""
+
+import time
+from dataclasses import dataclass
+
+from dashboard import service
+
+IDLE, RUNNING, DONE, FAILED = 'idle', 'running', 'done', 'failed'
+
+
+@dataclass
+class WarmupStatus:
+    state: str = IDLE
+    version: str = None
+    # Label of the step being run and progress through the planned steps
+    step: str = None
+    done: int = 0
+    total: int = 0
+    started_at: float = None
+    finished_at: float = None
+    error: str = None
+
+
+def _step(status, label, build):
+    status.step = label
+    result = build()
+    status.done += 1
+    return result
+
+
+def warm_data(fingerprint, changes_head, status):
+    """Load the dataset for this state and build its aggregates; returns (df, version, lineage)."""
+    status.total += 5
+    df, version, data_lineage = _step(status, "Loading data", lambda: service.load_data(fingerprint, changes_head))
+    status.version = version
+    cube = _step(status, "Count cube", lambda: service.load_cube(version, df))
+    _step(status, "Summary", lambda: service.load_summary(version, None, cube, df))
+    _step(status, "Filter index", lambda: service.load_filter_index(version, df))
+    _step(status, "3D features", lambda: service.load_features(version, df))
+    return df, version, data_lineage
+
+
+def warm_figures(df, version, status):
+    """Build the default figures (and Filtered Analysis summary) of every page for ``version``."""
+    # Imported here so plotly is loaded off the request path
+    from dashboard import charts
+    from dashboard.scatter3d import AGGREGATED
+
+    status.total += 1 + len(charts.COUNT_CHARTS) + 2 + len(charts.SCATTER3D_CHARTS) + 1
+    cube = service.load_cube(version, df)
+    features = service.load_features(version, df)
+
+    filters = charts.default_filters(cube)
+    _step(status, "Filtered summary", lambda: service.load_summary(version, filters, cube, df))
+    for chart_id in charts.COUNT_CHARTS:
+        state = filters if chart_id.startswith('filtered_') else None
+        _step(status, f"Chart {chart_id}", lambda: service.cached_figure(
+            version, chart_id, lambda: charts.count_chart(cube, chart_id, state), state))
+
+    row, column, measure = charts.DEFAULT_PAIR
+    table = service.load_crosstab(version, row, column, cube)
+    values = getattr(table, service.CROSSTAB_MEASURES[measure])()
+    _step(status, "Chart pair_bars", lambda: service.cached_figure(
+        version, 'pair_bars', lambda: charts.pair_bars(values, measure), (row, column, measure)))
+    _step(status, "Chart pair_heatmap", lambda: service.cached_figure(
+        version, 'pair_heatmap', lambda: charts.pair_heatmap(values, measure), (row, column, measure)))
+    for chart_id in charts.SCATTER3D_CHARTS:
+        _step(status, f"Chart {chart_id}", lambda: service.cached_figure(
+            version, chart_id, lambda: charts.fixed_scatter3d(features, chart_id, AGGREGATED), AGGREGATED))
+    axes = charts.DEFAULT_CUSTOM_AXES
+    _step(status, "Chart 3d_custom", lambda: service.cached_figure(
+        version, '3d_custom', lambda: charts.custom_scatter3d(features, AGGREGATED, axes), (AGGREGATED,) + axes))
+
+
+def main():
+    # Build the on-disk column store so new server processes start from it
+    from dashboard import changelog
+    from dashboard.colstore import open_dataset
+
+    started = time.time()
+    df, version = open_dataset(known_lineages=changelog.known_lineages())
+    print(f"Dataset {version}: {len(df):,} rows ready in {time.time() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
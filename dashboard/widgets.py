@@ -0,0 +1,67 @@
+"""Streamlit building blocks shared by the dashboard pages."""
+
+import streamlit as st
+
+from dashboard import config, profiler
+from dashboard.paging import page_bounds, window
+from dashboard.service import load_sort_order
+
+
+def show_chart(chart_id, fig):
+    # st.plotly_chart, timing Streamlit's serialization of the figure
+    with profiler.section(f"plotly_chart {chart_id}"):
+        st.plotly_chart(fig, use_container_width=True)  # type: ignore
+
+
+def show_dataframe(name, frame):
+    # st.dataframe, timing serialization and recording the Arrow payload size
+    with profiler.section(f"dataframe {name}"):
+        st.dataframe(frame, use_container_width=True)  # type: ignore
+    profiler.payload('dataframe', name, lambda: profiler.arrow_nbytes(frame))
+
+
+def table_window(df, version, key, rows=None):
+    # Sort and page controls for a table over df (optionally only `rows`);
+    # returns the row positions of the current page, the only rows sent to the browser
+    n_rows = len(df) if rows is None else len(rows)
+    page_sizes = sorted(set(config.PAGE_SIZES + [config.PAGE_SIZE]))
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        sort_by = st.selectbox("Sort by", ["(original order)"] + list(df.columns), key=f"{key}_sort")
+    with col2:
+        descending = st.selectbox("Order", ["Ascending", "Descending"], key=f"{key}_order") == "Descending"
+    with col3:
+        page_size = st.selectbox("Rows per page", page_sizes, index=page_sizes.index(config.PAGE_SIZE), key=f"{key}_page_size")
+    _, _, n_pages = page_bounds(n_rows, page_size, 1)
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    with col4:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+
+    start, stop, _ = page_bounds(n_rows, page_size, int(page))
+    st.caption(f"Rows {start + 1 if n_rows else 0:,}–{stop:,} of {n_rows:,} (page {int(page)} of {n_pages})")
+    order = None if sort_by == "(original order)" else load_sort_order(version, sort_by, not descending, df)
+    return window(len(df), rows, order, start, stop)
+
+
+def profile_panel(profile):
+    # Debug panel with a rerun's profile in the sidebar; nothing when profiling is off
+    if profile is None:
+        return
+    import pandas as pd
+
+    with st.sidebar.expander("🛠️ Rerun Profile"):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Rerun", f"{profile.total_seconds * 1000:,.0f} ms")
+        with col2:
+            st.metric("Peak memory", f"{profile.peak_bytes / 1024 ** 2:,.1f} MB")
+        st.write("**Sections**")
+        st.dataframe(pd.DataFrame(
+            [('  ' * depth + name, seconds * 1000) for name, depth, seconds in profile.sections],
+            columns=['Section', 'ms']), hide_index=True)
+        st.write("**Caches**")
+        st.dataframe(pd.DataFrame.from_dict(profile.caches, orient='index'))
+        st.write("**Payloads**")
+        st.dataframe(pd.DataFrame(profile.payloads, columns=['Kind', 'Name', 'Bytes']), hide_index=True)